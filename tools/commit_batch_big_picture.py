@@ -8,100 +8,421 @@ for selected commits, including check results and touched file snapshots.
 
 import argparse
 import hashlib
+import http.client
 import json
 import os
 import re
-import shlex
+import select
+import shutil
+import sqlite3
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
+from functools import lru_cache, partial
 from itertools import combinations
-from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Set, Tuple
+from urllib.parse import urlparse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FULL_SHA_RE = re.compile(r"[0-9a-fA-F]{40}")
+ACTIONS_RUN_ID_RE = re.compile(r"/actions/runs/(\d+)")
+GIT_PATH_ESCAPE_RE = re.compile(rb"\\([0-7]{3}|.)")
+
+# Section rules, built once. RULE_BYTES is for writes that go straight to the
+# binary output files without passing through write_text.
+RULE = "=" * 80 + "\n"
+THIN_RULE = "-" * 80 + "\n"
+RULE_BYTES = RULE.encode("utf-8")
 
 
 class SelectionParseError(ValueError):
     """Raised when a commit selection string cannot be parsed."""
 
 
-def run_command(cmd: str, check: bool = True, capture_output: bool = True) -> str:
-    """Run a shell command and return the result."""
+def parse_json(text: str | bytes) -> object:
+    """Parse JSON, using orjson when it is installed.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+    the same exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def dump_json(value: object) -> str:
+    """Serialize value to compact JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"))
+
+
+def run_command(
+    argv: List[str],
+    check: bool = True,
+    capture_output: bool = True,
+    input: str | None = None,
+) -> str:
+    """Run a command (argv list, no shell) and return the result."""
     result = subprocess.run(
-        cmd,
-        shell=True,
+        argv,
         check=check,
         capture_output=capture_output,
         text=True,
+        input=input,
     )
     return result.stdout.strip() if capture_output else ""
 
 
-def run_command_result(cmd: str) -> subprocess.CompletedProcess:
-    """Run a shell command and return the CompletedProcess."""
-    return subprocess.run(
-        cmd,
-        shell=True,
-        check=False,
-        capture_output=True,
-        text=True,
-    )
+def git_log_stdin(commit_shas: List[str], pathspecs: List[str] | None = None) -> str:
+    """Build ``git log --stdin`` input: one revision per line, then ``--`` and pathspecs.
 
+    Piping revisions and paths keeps large selections clear of the OS
+    argument-length limit.
+    """
+    lines = list(commit_shas)
+    if pathspecs:
+        lines.append("--")
+        lines.extend(pathspecs)
+    return "".join(f"{line}\n" for line in lines)
 
-def run_command_bytes(cmd: str, check: bool = True) -> bytes:
-    """Run a shell command and return raw stdout bytes."""
-    result = subprocess.run(
-        cmd,
-        shell=True,
-        check=check,
-        capture_output=True,
-        text=False,
-    )
-    return result.stdout or b""
 
+def start_git_log(argv: List[str], stdin_text: str) -> subprocess.Popen:
+    """Start a streaming ``git log --stdin`` and feed it its revisions and paths.
 
-def decode_file_snapshot(content: bytes) -> Tuple[str, bool]:
-    """Decode git show output while flagging probable binary content."""
-    if not content:
-        return "", False
-    if b"\0" in content:
-        return "# (binary file omitted from report)", True
+    git reads all of stdin before it writes any output, so the input can be
+    written in full before the caller starts reading stdout.
+    """
+    proc = subprocess.Popen(
+        argv,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        proc.stdin.write(stdin_text)
+        proc.stdin.close()
+    except BrokenPipeError:
+        # git exited early (e.g. a bad revision); the caller sees its exit status.
+        pass
+    return proc
+
+
+# Past this many unread bytes, skip_blob() restarts cat-file rather than
+# reading the rest of a snapshot just to throw it away.
+SKIP_RESTART_BYTES = 4 << 20
+
+
+class CatFileBatch:
+    """Long-running ``git cat-file --batch`` process for reading file snapshots.
+
+    The process is started on first use so a single instance can be shared for
+    a whole run and closed unconditionally at the end.
+    """
+
+    def __init__(self) -> None:
+        self.process: subprocess.Popen | None = None
+        # Bytes of the current snapshot not yet read, trailing newline included.
+        self.unread = 0
+
+    def __enter__(self) -> "CatFileBatch":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Terminate the cat-file process if it was started."""
+        if self.process is None:
+            return
+        if self.process.stdin:
+            self.process.stdin.close()
+        if self.unread:
+            # git may be blocked writing a snapshot that will never be read.
+            self.process.kill()
+        self.process.wait()
+        self.process = None
+        self.unread = 0
+
+    def open_blob(self, commit_sha: str, file_path: str) -> int | None:
+        """Request a file snapshot and return its size, or None if it does not exist.
+
+        The snapshot is read with read_chunks(); whatever is left unread is
+        skipped before the next request.
+        """
+        if self.unread:
+            self.skip_blob()
+        request = f"{commit_sha}:{file_path}"
+        if "\n" in file_path:
+            # Requests are newline-delimited, so name this blob by its object ID.
+            request = run_command(["git", "rev-parse", "--verify", "--quiet", request], check=False)
+            if not request:
+                return None
+        if self.process is None:
+            self.process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        stdin = self.process.stdin
+        stdout = self.process.stdout
+        assert stdin is not None and stdout is not None
+
+        try:
+            stdin.write(f"{request}\n".encode("utf-8"))
+            stdin.flush()
+        except BrokenPipeError as exc:
+            raise RuntimeError("git cat-file --batch exited unexpectedly") from exc
+        header = stdout.readline()
+        if not header:
+            raise RuntimeError("git cat-file --batch exited unexpectedly")
+
+        fields = header.split()
+        if fields[-1] in (b"missing", b"ambiguous"):
+            return None
+        size = int(fields[2])
+        self.unread = size + 1
+        return size
+
+    def read_chunks(self, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """Yield the rest of the current snapshot in chunks, then consume its trailing newline."""
+        assert self.process is not None and self.process.stdout is not None
+        stdout = self.process.stdout
+        while self.unread > 1:
+            chunk = stdout.read(min(chunk_size, self.unread - 1))
+            if not chunk:
+                raise RuntimeError("git cat-file --batch exited unexpectedly")
+            self.unread -= len(chunk)
+            yield chunk
+        stdout.read(1)
+        self.unread = 0
+
+    def skip_blob(self) -> None:
+        """Drop whatever is left of the current snapshot.
+
+        Short remainders are read and discarded. Longer ones stop the process
+        instead, and the next request starts a fresh one, so git does not
+        inflate and pipe a large blob (usually a binary) that nobody reads.
+        """
+        if self.unread > SKIP_RESTART_BYTES:
+            self.close()
+            return
+        for _chunk in self.read_chunks():
+            pass
+
+
+BINARY_PLACEHOLDER = "# (binary file omitted from report)"
+
+# Output files are written in binary mode with a large buffer so multi-megabyte
+# reports go out in few, large write syscalls.
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+def is_probably_binary(sample: bytes) -> bool:
+    """Flag probable binary content from the leading bytes of a file snapshot."""
+    if not sample:
+        return False
+    if b"\0" in sample:
+        return True
 
     control_bytes = sum(
-        1 for byte in content if byte < 9 or (13 < byte < 32)
+        1 for byte in sample if byte < 9 or (13 < byte < 32)
     )
-    if control_bytes / len(content) > 0.1:
-        return "# (binary file omitted from report)", True
+    return control_bytes / len(sample) > 0.1
 
-    return content.decode("utf-8", errors="replace"), False
 
+@contextmanager
+def open_output(path: str) -> Iterator[BinaryIO]:
+    """Open an output file for buffered binary writing, replacing path on success.
 
-def resolve_commit(ref: str) -> str:
-    """Resolve a commit ref to a full SHA."""
-    cleaned = ref.strip()
-    if not cleaned:
-        raise SelectionParseError("Invalid commit token: empty ref")
+    Data goes to ``<path>.tmp`` first, so an interrupted run leaves the
+    previous file (or none) instead of a truncated one.
+    """
+    tmp_path = f"{path}.tmp"
     try:
-        sha = run_command(f"git rev-parse --verify {shlex.quote(cleaned)}")
-    except subprocess.CalledProcessError as exc:
-        raise SelectionParseError(
-            f"Invalid commit token '{ref}': {exc}"
-        ) from exc
-    if not re.fullmatch(r"[0-9a-fA-F]{40}", sha):
-        raise SelectionParseError(
-            f"Invalid commit token '{ref}': resolved to '{sha}'"
-        )
-    return sha
+        with open(tmp_path, "wb", buffering=OUTPUT_BUFFER_SIZE) as outf:
+            yield outf
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def write_text(outf: BinaryIO, text: str) -> None:
+    """Write text to a binary output file as UTF-8."""
+    outf.write(text.encode("utf-8"))
+
+
+class TeeWriter:
+    """Fan a single stream of binary writes out to several output files."""
+
+    def __init__(self, outputs: List[BinaryIO]) -> None:
+        self.outputs = outputs
+
+    def write(self, data: bytes) -> int:
+        for output in self.outputs:
+            output.write(data)
+        return len(data)
+
+
+class SnapshotCache:
+    """Byte-bounded LRU of rendered file snapshots keyed by (commit, path).
+
+    A file's "after" snapshot in one commit is its "before" snapshot in the
+    next, so snapshots that fit in a single read chunk are kept and replayed
+    instead of being read from git again.
+    """
+
+    def __init__(self, max_bytes: int = 64 << 20) -> None:
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries: "OrderedDict[Tuple[str, str], Tuple[bytes, bool]]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str]) -> Tuple[bytes, bool] | None:
+        """Return the rendered snapshot and its binary flag, if cached."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Tuple[str, str], rendered: bytes, is_binary: bool) -> None:
+        """Cache a rendered snapshot, evicting the oldest entries over budget."""
+        if key in self.entries or len(rendered) > self.max_bytes:
+            return
+        self.entries[key] = (rendered, is_binary)
+        self.total_bytes += len(rendered)
+        while self.total_bytes > self.max_bytes:
+            _key, (evicted, _is_binary) = self.entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+
+
+def write_file_snapshot(
+    outf: BinaryIO,
+    cat_file: CatFileBatch,
+    commit_sha: str,
+    file_path: str,
+    missing_note: str,
+    cache: SnapshotCache | None = None,
+) -> bool:
+    """Stream a file snapshot into outf, newline-terminated; return True if binary.
+
+    Binary detection looks at the first chunk only, so large files are never
+    held in memory and the rest of a binary is skipped unread. Snapshots that
+    fit in that first chunk are rendered in memory and, when a cache is given,
+    reused for later requests.
+    """
+    key = (commit_sha, file_path)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            outf.write(cached[0])
+            return cached[1]
+
+    size = cat_file.open_blob(commit_sha, file_path)
+    if size is None:
+        write_text(outf, f"{missing_note}\n")
+        return False
 
+    chunks = cat_file.read_chunks()
+    first = next(chunks, b"")
+    is_binary = is_probably_binary(first)
+    if len(first) == size:
+        next(chunks, None)
+        if is_binary:
+            rendered = f"{BINARY_PLACEHOLDER}\n".encode("utf-8")
+        elif first.endswith(b"\n"):
+            rendered = first
+        else:
+            rendered = first + b"\n"
+        outf.write(rendered)
+        if cache is not None:
+            cache.put(key, rendered, is_binary)
+        return is_binary
+
+    if is_binary:
+        cat_file.skip_blob()
+        write_text(outf, f"{BINARY_PLACEHOLDER}\n")
+        return True
+
+    last = first
+    outf.write(first)
+    for chunk in chunks:
+        outf.write(chunk)
+        last = chunk
+    if not last.endswith(b"\n"):
+        outf.write(b"\n")
+    return False
+
+
+def resolve_commits(refs: List[str]) -> Dict[str, str]:
+    """Resolve commit refs to full SHAs with one ``git cat-file --batch-check`` call.
+
+    cat-file answers every ref on its own line, so a bad token is reported
+    without re-running git per ref.
+    """
+    unique_refs = list(dict.fromkeys(ref.strip() for ref in refs))
+    if not unique_refs:
+        return {}
+    if "" in unique_refs:
+        raise SelectionParseError("Invalid commit token: empty ref")
 
-def ensure_ancestor(start: str, end: str, original: str) -> None:
-    """Ensure start is an ancestor of end."""
-    result = run_command_result(
-        f"git merge-base --is-ancestor {shlex.quote(start)} {shlex.quote(end)}"
-    )
-    if result.returncode != 0:
+    try:
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+            input="".join(f"{ref}^{{commit}}\n" for ref in unique_refs),
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except subprocess.CalledProcessError as exc:
+        raise SelectionParseError(f"Invalid commit selection: {exc}") from exc
+
+    lines = result.stdout.splitlines()
+    resolved: Dict[str, str] = {}
+    for idx, ref in enumerate(unique_refs):
+        line = lines[idx] if idx < len(lines) else ""
+        fields = line.split()
+        if len(fields) == 2 and fields[1] == "commit" and FULL_SHA_RE.fullmatch(fields[0]):
+            resolved[ref] = fields[0]
+        elif fields and fields[-1] in ("missing", "ambiguous"):
+            raise SelectionParseError(f"Invalid commit token '{ref}': {fields[-1]}")
+        else:
+            raise SelectionParseError(f"Invalid commit token '{ref}': resolved to '{line}'")
+    return resolved
+
+
+def list_range_commits(start: str, end: str, original: str) -> List[str]:
+    """Return the commits in ``start..end`` (oldest first), checking ancestry.
+
+    With ``--boundary`` rev-list also prints the excluded parents of listed
+    commits prefixed with ``-``; ``start`` is among them exactly when it is
+    an ancestor of ``end``, which saves a separate ``merge-base`` call.
+    """
+    range_commits: List[str] = []
+    boundary: Set[str] = set()
+    output = run_command(["git", "rev-list", "--reverse", "--boundary", f"{start}..{end}"])
+    for line in output.splitlines():
+        if line.startswith("-"):
+            boundary.add(line[1:])
+        elif line:
+            range_commits.append(line)
+    if start not in boundary:
         raise SelectionParseError(
             f"Invalid commit range '{original}': '{start}' is not an ancestor of '{end}'."
         )
+    return range_commits
 
 
 def parse_commit_selection(selection: str) -> List[str]:
@@ -121,11 +442,9 @@ def parse_commit_selection(selection: str) -> List[str]:
             "Expected format like 'abc123,def456' or 'abc123-def456'."
         )
 
-    selected: List[str] = []
-    seen: Set[str] = set()
-
+    parsed_segments: List[Tuple[str, List[str]]] = []
     for segment in segments:
-        cleaned = re.sub(r"\s+", "", segment)
+        cleaned = "".join(segment.split())
         if not cleaned:
             raise SelectionParseError(
                 f"Invalid commit selection segment '{segment}' in '{original}'. "
@@ -133,38 +452,38 @@ def parse_commit_selection(selection: str) -> List[str]:
             )
 
         parts = cleaned.split("-")
-        if len(parts) == 1:
-            commit = resolve_commit(parts[0])
-            if commit not in seen:
-                selected.append(commit)
-                seen.add(commit)
-        elif len(parts) == 2:
-            start_ref, end_ref = parts
-            if not start_ref or not end_ref:
-                raise SelectionParseError(
-                    f"Invalid commit range '{segment}' in '{original}'. "
-                    "Expected format like 'abc123-def456'."
-                )
-            start = resolve_commit(start_ref)
-            end = resolve_commit(end_ref)
-            ensure_ancestor(start, end, segment)
-            if start == end:
-                if start not in seen:
-                    selected.append(start)
-                    seen.add(start)
-                continue
-            range_commits = run_command(
-                f"git rev-list --reverse {shlex.quote(start)}..{shlex.quote(end)}"
-            ).splitlines()
-            for commit in [start] + range_commits:
-                if commit and commit not in seen:
-                    selected.append(commit)
-                    seen.add(commit)
-        else:
+        if len(parts) == 2 and (not parts[0] or not parts[1]):
+            raise SelectionParseError(
+                f"Invalid commit range '{segment}' in '{original}'. "
+                "Expected format like 'abc123-def456'."
+            )
+        if len(parts) > 2:
             raise SelectionParseError(
                 f"Invalid commit selection segment '{segment}' in '{original}'. "
                 "Expected format like 'abc123,def456' or 'abc123-def456'."
             )
+        parsed_segments.append((segment, parts))
+
+    resolved = resolve_commits([ref for _segment, parts in parsed_segments for ref in parts])
+
+    selected: Dict[str, None] = {}
+    expanded_ranges: Set[Tuple[str, str]] = set()
+
+    for segment, parts in parsed_segments:
+        if len(parts) == 1:
+            selected[resolved[parts[0]]] = None
+            continue
+
+        start = resolved[parts[0]]
+        end = resolved[parts[1]]
+        # Different spellings of the same range resolve to the same SHAs.
+        if (start, end) in expanded_ranges:
+            continue
+        expanded_ranges.add((start, end))
+        selected[start] = None
+        if start == end:
+            continue
+        selected.update(dict.fromkeys(list_range_commits(start, end, segment)))
 
     if not selected:
         raise SelectionParseError(
@@ -172,7 +491,7 @@ def parse_commit_selection(selection: str) -> List[str]:
             "Expected format like 'abc123,def456' or 'abc123-def456'."
         )
 
-    return selected
+    return list(selected)
 
 
 def format_commit_selection(commits: List[str]) -> str:
@@ -180,25 +499,65 @@ def format_commit_selection(commits: List[str]) -> str:
     return ",".join(commits)
 
 
-def build_selection_tag(selected_commits: List[str], selection_canonical: str) -> str:
+def short_commit_shas(commits: List[str]) -> List[str]:
+    """Abbreviate commit SHAs the way selection messages and tags display them."""
+    return [commit[:8] for commit in commits]
+
+
+def build_selection_tag(
+    selected_commits: List[str],
+    selection_canonical: str,
+    short_shas: List[str] | None = None,
+) -> str:
     selection_hash = hashlib.sha1(selection_canonical.encode("utf-8")).hexdigest()[:8]
     if not selected_commits:
         return f"0commits-{selection_hash}"
-    first_short = selected_commits[0][:8]
-    last_short = selected_commits[-1][:8]
-    return f"{first_short}-{last_short}-{len(selected_commits)}commits-{selection_hash}"
+    if short_shas is None:
+        short_shas = short_commit_shas([selected_commits[0], selected_commits[-1]])
+    return f"{short_shas[0]}-{short_shas[-1]}-{len(selected_commits)}commits-{selection_hash}"
 
 
-def format_commit_list_preview(commits: List[str], max_items: int = 10, edge_items: int = 3) -> str:
+def compilation_output_paths(
+    output_dir: str, selection_tag: str, include_logs: bool
+) -> Dict[str, str]:
+    """Return the master, summary and touched output paths for one variant.
+
+    Keys match the variant dicts taken by emit_all_outputs.
+    """
+    suffix = f"{selection_tag}-with-logs.txt" if include_logs else f"{selection_tag}.txt"
+    return {
+        "master_output": os.path.join(output_dir, f"commit-comparison-{suffix}"),
+        "summary_output": os.path.join(output_dir, f"commit-summaries-{suffix}"),
+        "touched_output": os.path.join(output_dir, f"commit-touched-files-{suffix}"),
+    }
+
+
+def format_commit_list_preview(
+    commits: List[str],
+    max_items: int = 10,
+    edge_items: int = 3,
+    short_shas: List[str] | None = None,
+) -> str:
     if len(commits) <= max_items:
-        return ", ".join(commit[:8] for commit in commits)
-    head = ", ".join(commit[:8] for commit in commits[:edge_items])
-    tail = ", ".join(commit[:8] for commit in commits[-edge_items:])
+        return ", ".join(short_shas if short_shas is not None else short_commit_shas(commits))
+    if short_shas is None:
+        short_shas = short_commit_shas(commits[:edge_items] + commits[-edge_items:])
+    head = ", ".join(short_shas[:edge_items])
+    tail = ", ".join(short_shas[-edge_items:])
     return f"{head} ... {tail}"
 
 
+@lru_cache(maxsize=None)
+def generated_timestamp() -> str:
+    """Return the "Generated" timestamp, fixed at first use so every output of a run agrees."""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
 def selection_header_lines(
-    selection_requested: str, selection_canonical: str, selected_commits: List[str]
+    selection_requested: str,
+    selection_canonical: str,
+    selected_commits: List[str],
+    short_shas: List[str] | None = None,
 ) -> List[str]:
     lines = [
         f"# Commit selection (requested): {selection_requested}",
@@ -206,13 +565,20 @@ def selection_header_lines(
     ]
     if selected_commits:
         if len(selected_commits) <= 20:
-            expanded = ", ".join(commit[:8] for commit in selected_commits)
+            if short_shas is None:
+                short_shas = short_commit_shas(selected_commits)
+            expanded = ", ".join(short_shas)
             lines.append(f"# Expanded commits (count={len(selected_commits)}): {expanded}")
         else:
-            preview = format_commit_list_preview(selected_commits)
+            preview = format_commit_list_preview(selected_commits, short_shas=short_shas)
+            first_short, last_short = (
+                (short_shas[0], short_shas[-1])
+                if short_shas is not None
+                else short_commit_shas([selected_commits[0], selected_commits[-1]])
+            )
             lines.append(
                 f"# Expanded commits: count={len(selected_commits)} "
-                f"min={selected_commits[0][:8]} max={selected_commits[-1][:8]} preview={preview}"
+                f"min={first_short} max={last_short} preview={preview}"
             )
     else:
         lines.append("# Expanded commits: count=0")
@@ -221,7 +587,7 @@ def selection_header_lines(
 
 def check_current_branch(expected_branch: str) -> None:
     """Ensure we're starting from the expected base branch."""
-    current_branch = run_command("git branch --show-current")
+    current_branch = run_command(["git", "branch", "--show-current"])
     if current_branch != expected_branch:
         print(
             f"Error: Currently on branch '{current_branch}'. "
@@ -231,61 +597,349 @@ def check_current_branch(expected_branch: str) -> None:
     print(f"✓ Starting from {expected_branch} branch")
 
 
-def checkout_base_branch(base_branch: str) -> None:
-    """Checkout the base branch."""
-    print(f"Checking out {base_branch} branch...")
-    run_command(f"git checkout {shlex.quote(base_branch)}")
-    print(f"✓ Checked out {base_branch} branch")
-
-
 def fetch_remote_branches(remote: str) -> None:
     """Fetch latest remote branches."""
     print(f"Fetching remote branches from {remote}...")
-    run_command(f"git fetch {shlex.quote(remote)} --prune --tags")
+    run_command(["git", "fetch", remote, "--prune", "--tags"], capture_output=False)
     print("✓ Fetched remote branches")
 
 
+def write_commit_graph() -> None:
+    """Write a commit-graph with changed-path Bloom filters for this repository.
+
+    Speeds up the rev-list walks behind range selections on long histories.
+    Failure is only a warning: git works the same without the graph.
+    """
+    print("Writing commit-graph...")
+    result = subprocess.run(
+        ["git", "commit-graph", "write", "--reachable", "--changed-paths", "--no-progress"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        reason = result.stderr.strip() or f"exit status {result.returncode}"
+        print(f"Warning: Failed to write commit-graph: {reason}")
+        return
+    print("✓ Wrote commit-graph")
+
+
+@lru_cache(maxsize=None)
+def get_repo_view() -> Dict[str, str]:
+    """Get repository metadata via gh; cached so a run asks gh only once."""
+    return parse_json(run_command(["gh", "repo", "view", "--json", "url,nameWithOwner"]))
+
+
 def get_repo_url() -> str:
     """Get the repository URL via gh, if available."""
     try:
-        return run_command("gh repo view --json url -q .url")
-    except subprocess.CalledProcessError:
+        return get_repo_view().get("url") or ""
+    except (subprocess.CalledProcessError, OSError, json.JSONDecodeError):
         return ""
 
 
 def get_repo_name_with_owner() -> str:
     """Get repository name with owner via gh."""
-    return run_command("gh repo view --json nameWithOwner -q .nameWithOwner")
+    return get_repo_view()["nameWithOwner"]
+
+
+def build_commit_index(
+    commit_shas: List[str], repo_url: str
+) -> Dict[str, Dict[str, object]]:
+    """Index commits by SHA with their metadata, first parent, and changed files.
+
+    One git log call covers every commit. Each entry holds ``info`` (the
+    commit metadata dict), ``parent`` (None for root commits), and ``files``
+    (path -> A/M/D/T status). With -z the paths are verbatim rather than
+    C-quoted, so they work as pathspecs and cat-file paths as they are.
+    """
+    if not commit_shas:
+        return {}
+    # NUL/SOH separators: run_command strips output, and str.strip() treats
+    # the ASCII unit/record separators (\x1f/\x1e) as whitespace. Each record
+    # is SOH, eight NUL-terminated fields, then the -z --raw entries as
+    # NUL-terminated ":<meta>" and path tokens.
+    log_format = "--format=%x01%H%x00%h%x00%an%x00%ae%x00%ad%x00%s%x00%b%x00%P%x00"
+    output = run_command(
+        [
+            "git",
+            "log",
+            "--no-walk=unsorted",
+            "--date=iso-strict",
+            "--root",
+            "--no-renames",
+            "--raw",
+            "-z",
+            "--stdin",
+            log_format,
+        ],
+        input=git_log_stdin(commit_shas),
+    )
 
+    index: Dict[str, Dict[str, object]] = {}
+    for record in output.split("\x01"):
+        if not record:
+            continue
+        parts = record.split("\x00")
+        if len(parts) < 9:
+            raise ValueError(f"Unexpected git log output for commit record '{record[:40]}'")
+        full_sha, short_sha, author, email, date, subject, body, parent_list = parts[:8]
+
+        statuses: Dict[str, str] = {}
+        raw_tokens = parts[8:]
+        idx = 0
+        while idx < len(raw_tokens):
+            # ":<old mode> <new mode> <old oid> <new oid> <status>", then the path.
+            meta = raw_tokens[idx].lstrip("\n")
+            if meta.startswith(":") and idx + 1 < len(raw_tokens):
+                statuses[raw_tokens[idx + 1]] = meta.split()[-1]
+                idx += 2
+            else:
+                idx += 1
+
+        parent_shas = parent_list.split()
+        index[full_sha] = {
+            "info": {
+                "sha": full_sha,
+                "short": short_sha,
+                "author": author,
+                "email": email,
+                "date": date,
+                "subject": subject,
+                "body": body.strip(),
+                "url": f"{repo_url}/commit/{full_sha}" if repo_url else "",
+            },
+            "parent": parent_shas[0] if parent_shas else None,
+            "files": statuses,
+        }
+    return index
+
+
+# Bump when the shape of cached index entries or the diff options change, so
+# stale CommitCache rows are ignored.
+EXTRACTION_VERSION = 2
+
+
+class CommitCache:
+    """SQLite store of git-derived commit data (index entries, diffs) by SHA.
+
+    Commits are immutable, so this data can be reused across runs; checks
+    and logs change over time and are never cached. Only used from the main
+    thread. Rows from another EXTRACTION_VERSION count as misses.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS commits ("
+            "sha TEXT, kind TEXT, version INTEGER, value TEXT, PRIMARY KEY (sha, kind))"
+        )
 
-def get_commit_info(commit_sha: str, repo_url: str) -> Dict[str, str]:
-    """Get metadata for a specific commit."""
-    output = run_command(
-        "git show -s --format=%H%x00%h%x00%an%x00%ae%x00%ad%x00%s%x00%b "
-        f"--date=iso-strict {shlex.quote(commit_sha)}"
+    def cached_shas(self, kind: str, commit_shas: List[str]) -> Set[str]:
+        """Return the subset of commit_shas that have a current ``kind`` row."""
+        found: Set[str] = set()
+        for start in range(0, len(commit_shas), 500):
+            batch = commit_shas[start : start + 500]
+            rows = self.conn.execute(
+                "SELECT sha FROM commits WHERE kind = ? AND version = ? "
+                f"AND sha IN ({','.join('?' * len(batch))})",
+                (kind, EXTRACTION_VERSION, *batch),
+            )
+            found.update(sha for (sha,) in rows)
+        return found
+
+    def get(self, kind: str, commit_sha: str) -> str | None:
+        row = self.conn.execute(
+            "SELECT value FROM commits WHERE sha = ? AND kind = ? AND version = ?",
+            (commit_sha, kind, EXTRACTION_VERSION),
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, kind: str, commit_sha: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?)",
+            (commit_sha, kind, EXTRACTION_VERSION, value),
+        )
+
+    def close(self) -> None:
+        """Commit pending rows and close the database."""
+        self.conn.commit()
+        self.conn.close()
+
+
+def load_commit_index(
+    commit_shas: List[str], repo_url: str, cache: CommitCache | None
+) -> Dict[str, Dict[str, object]]:
+    """build_commit_index, reusing and filling cache entries when a cache is given."""
+    if cache is None:
+        return build_commit_index(commit_shas, repo_url)
+
+    cached = cache.cached_shas("index", commit_shas)
+    index = build_commit_index([sha for sha in commit_shas if sha not in cached], repo_url)
+    for sha, entry in index.items():
+        info = {key: value for key, value in entry["info"].items() if key != "url"}
+        cache.put("index", sha, dump_json({**entry, "info": info}))
+    for sha in cached:
+        entry = parse_json(cache.get("index", sha))
+        entry["info"]["url"] = f"{repo_url}/commit/{sha}" if repo_url else ""
+        index[sha] = entry
+    return index
+
+
+def show_commit_diff(commit_sha: str) -> str:
+    """Return one commit's diff with excluded files left out."""
+    return run_command(
+        ["git", "show", "--root", "--pretty=format:", commit_sha, "--", *EXCLUDED_PATHSPECS]
     )
-    parts = output.split("\x00")
-    if len(parts) < 7:
-        raise ValueError(f"Unexpected git show output for commit {commit_sha}")
-    full_sha, short_sha, author, email, date, subject, body = parts[:7]
-    return {
-        "sha": full_sha,
-        "short": short_sha,
-        "author": author,
-        "email": email,
-        "date": date,
-        "subject": subject,
-        "body": body.strip(),
-        "url": f"{repo_url}/commit/{full_sha}" if repo_url else "",
-    }
 
 
-def get_commit_changed_files(commit_sha: str) -> List[str]:
-    """Get list of changed files for a specific commit."""
-    output = run_command(
-        f"git diff-tree --no-commit-id --name-only -r --root {shlex.quote(commit_sha)}"
+def iter_commit_diffs(commit_shas: List[str]) -> Iterator[Tuple[str, str]]:
+    """Yield ``(sha, diff)`` for each commit, in order, from one ``git log -p``.
+
+    Each diff matches show_commit_diff (``--cc`` gives merges the same
+    combined diff as git show). Diff lines always start with a git-generated
+    prefix, so a line starting with NUL can only be a per-commit marker.
+    Commits git log leaves out, such as those whose only changes are
+    excluded, are diffed one by one, as is the last commit if git log fails.
+    """
+    if not commit_shas:
+        return
+    pending = iter(commit_shas)
+    current_sha: str | None = None
+    lines: List[str] = []
+    with start_git_log(
+        [
+            "git",
+            "log",
+            "--no-walk=unsorted",
+            "--root",
+            "--cc",
+            "--stdin",
+            "--format=%x00%H",
+        ],
+        git_log_stdin(commit_shas, EXCLUDED_PATHSPECS),
+    ) as proc:
+        for line in proc.stdout:
+            if not line.startswith("\x00"):
+                lines.append(line)
+                continue
+            if current_sha is not None:
+                yield current_sha, "".join(lines).strip()
+            current_sha = line[1:].rstrip("\n")
+            lines = []
+            for sha in pending:
+                if sha == current_sha:
+                    break
+                yield sha, show_commit_diff(sha)
+    if current_sha is not None:
+        if proc.returncode == 0:
+            yield current_sha, "".join(lines).strip()
+        else:
+            yield current_sha, show_commit_diff(current_sha)
+    for sha in pending:
+        yield sha, show_commit_diff(sha)
+
+
+GIT_PATH_ESCAPES = {
+    b"a": b"\a",
+    b"b": b"\b",
+    b"t": b"\t",
+    b"n": b"\n",
+    b"v": b"\v",
+    b"f": b"\f",
+    b"r": b"\r",
+    b'"': b'"',
+    b"\\": b"\\",
+}
+
+
+def unquote_git_path(path: str) -> str:
+    """Undo git's C-style quoting of a path (``"tab\\tname"`` -> tab<TAB>name).
+
+    Unquoted paths are returned unchanged; git always quotes a path that
+    starts with a double quote.
+    """
+    if len(path) < 2 or not (path.startswith('"') and path.endswith('"')):
+        return path
+    raw = GIT_PATH_ESCAPE_RE.sub(
+        lambda match: bytes([int(match.group(1), 8)])
+        if len(match.group(1)) == 3
+        else GIT_PATH_ESCAPES.get(match.group(1), match.group(1)),
+        path[1:-1].encode("utf-8"),
     )
-    return [line for line in output.splitlines() if line.strip()]
+    return raw.decode("utf-8", errors="replace")
+
+
+def diff_header_path(header: str) -> str:
+    """Return the path a ``diff --git``/``diff --cc`` header line refers to.
+
+    git quotes unusual paths in these headers; the path is returned
+    unquoted so it matches the verbatim keys of the commit index.
+    ``diff --git`` headers must come from a diff run with ``--no-renames``
+    and the default a/ b/ prefixes, so both halves name the same path.
+    """
+    rest = header.rstrip("\n").split(" ", 2)[2]
+    if header.startswith("diff --git "):
+        first = rest[: (len(rest) - 1) // 2]
+        return unquote_git_path('"' + first[3:] if first.startswith('"') else first[2:])
+    return unquote_git_path(rest)
+
+
+def iter_file_diffs(
+    commit_shas: List[str], paths: List[str]
+) -> Iterator[Tuple[str, Dict[str, str] | None]]:
+    """Yield ``(sha, {path: diff})`` for each commit, in order, from one ``git log -p``.
+
+    Only paths are diffed; each diff matches ``git show <sha> -- <path>``
+    and paths with no diff are left out. None stands in for the mapping when
+    git log fails, so the caller can fall back to diffing files one by one.
+    """
+    if not commit_shas:
+        return
+    pending = iter(commit_shas)
+    current_sha: str | None = None
+    sections: Dict[str, List[str]] = {}
+    lines: List[str] = []
+    with start_git_log(
+        [
+            "git",
+            "log",
+            "--no-walk=unsorted",
+            "--root",
+            "--cc",
+            "--no-renames",
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+            "--stdin",
+            "--format=%x00%H",
+        ],
+        git_log_stdin(commit_shas, paths),
+    ) as proc:
+        for line in proc.stdout:
+            if line.startswith("diff --"):
+                lines = sections.setdefault(diff_header_path(line), [])
+            elif line.startswith("\x00"):
+                if current_sha is not None:
+                    yield current_sha, {
+                        path: "".join(section).strip() for path, section in sections.items()
+                    }
+                current_sha = line[1:].rstrip("\n")
+                sections = {}
+                lines = []
+                for sha in pending:
+                    if sha == current_sha:
+                        break
+                    yield sha, {}
+                continue
+            lines.append(line)
+    if current_sha is not None:
+        if proc.returncode == 0:
+            yield current_sha, {
+                path: "".join(section).strip() for path, section in sections.items()
+            }
+        else:
+            yield current_sha, None
+    for sha in pending:
+        yield sha, {} if proc.returncode == 0 else None
 
 
 def normalize_check_entry(check: Dict[str, str], check_type: str) -> Dict[str, str]:
@@ -300,54 +954,318 @@ def normalize_check_entry(check: Dict[str, str], check_type: str) -> Dict[str, s
     }
 
 
+# Longest rate-limit reset GitHubApiSession waits out before giving up.
+RATE_LIMIT_MAX_WAIT = 60
+
+
+def rate_limit_wait(response: http.client.HTTPResponse) -> float | None:
+    """Return seconds to wait before retrying a rate-limited response, or None.
+
+    Uses Retry-After (secondary limits) or X-RateLimit-Reset once the primary
+    limit is spent; None when neither applies or the wait is too long.
+    """
+    retry_after = response.getheader("Retry-After") or ""
+    reset = response.getheader("X-RateLimit-Reset") or ""
+    if retry_after.isdigit():
+        wait = float(retry_after)
+    elif response.getheader("X-RateLimit-Remaining") == "0" and reset.isdigit():
+        wait = max(int(reset) - time.time(), 0) + 1
+    else:
+        return None
+    return wait if wait <= RATE_LIMIT_MAX_WAIT else None
+
+
+class GitHubApiSession:
+    """Keep-alive HTTPS client for GitHub REST GETs, one connection per thread.
+
+    REST calls made through ``gh api`` each spawn a process and open a new
+    TLS connection; this reuses one connection per worker thread instead.
+    A transport failure marks the session broken so callers stop using it.
+    A rate-limited request is retried once after the advertised reset.
+    """
+
+    def __init__(self, token: str, host: str = "api.github.com") -> None:
+        self.host = host
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "commit_batch_big_picture",
+        }
+        self._local = threading.local()
+        self.broken = False
+
+    def get_json(self, path: str) -> object:
+        """GET ``/<path>`` and parse the JSON body; raise OSError on failure."""
+        retried = False
+        while True:
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._local.conn = http.client.HTTPSConnection(self.host, timeout=60)
+            try:
+                conn.request("GET", f"/{path}", headers=self.headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as exc:
+                conn.close()
+                self._local.conn = None
+                self.broken = True
+                raise OSError(f"GET /{path} failed: {exc}") from exc
+            if response.status in (403, 429) and not retried:
+                wait = rate_limit_wait(response)
+                if wait is not None:
+                    print(f"GitHub API rate limit hit; retrying in {wait:.0f}s")
+                    time.sleep(wait)
+                    retried = True
+                    continue
+            if response.status != 200:
+                raise OSError(f"GET /{path} failed: HTTP {response.status}")
+            return parse_json(body)
+
+
+@lru_cache(maxsize=None)
+def get_api_session() -> GitHubApiSession | None:
+    """Return a REST session using gh's token, or None to keep using ``gh api``.
+
+    Only github.com repositories get a session; other hosts stay on gh, which
+    already knows how to reach them.
+    """
+    if urlparse(get_repo_url()).hostname != "github.com":
+        return None
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    if not token:
+        try:
+            token = run_command(["gh", "auth", "token"])
+        except (subprocess.CalledProcessError, OSError):
+            return None
+    return GitHubApiSession(token) if token else None
+
+
+def github_rest_get(path: str) -> object:
+    """GET a GitHub REST path, over the shared session when one is available."""
+    session = get_api_session()
+    if session is not None and not session.broken:
+        try:
+            return session.get_json(path)
+        except (OSError, json.JSONDecodeError):
+            pass
+    return parse_json(run_command(["gh", "api", path]))
+
+
 def get_commit_checks(commit_sha: str, repo: str) -> List[Dict[str, str]]:
     """Get status check results for a specific commit."""
     checks: List[Dict[str, str]] = []
 
-    check_runs_json = run_command(
-        f"gh api repos/{shlex.quote(repo)}/commits/{shlex.quote(commit_sha)}/check-runs"
-    )
-    check_runs = json.loads(check_runs_json)
+    check_runs = github_rest_get(f"repos/{repo}/commits/{commit_sha}/check-runs")
     for check in check_runs.get("check_runs", []) or []:
         checks.append(normalize_check_entry(check, "check-run"))
 
-    status_json = run_command(
-        f"gh api repos/{shlex.quote(repo)}/commits/{shlex.quote(commit_sha)}/status"
-    )
-    status_data = json.loads(status_json)
+    status_data = github_rest_get(f"repos/{repo}/commits/{commit_sha}/status")
     for status in status_data.get("statuses", []) or []:
         checks.append(normalize_check_entry(status, "status"))
 
     return checks
 
 
+CHECKS_QUERY_BATCH_SIZE = 25
+CHECKS_PROBE_BATCH_SIZE = 100
+
+CHECKS_PROBE_COMMIT_FIELDS = """
+... on Commit { statusCheckRollup { state } }
+"""
+
+CHECKS_QUERY_COMMIT_FIELDS = """
+... on Commit {
+  checkSuites(first: 50) {
+    nodes {
+      checkRuns(first: 100, filterBy: {checkType: LATEST}) {
+        nodes { name status conclusion detailsUrl }
+      }
+    }
+  }
+  status { contexts { context state targetUrl description } }
+}
+"""
+
+
+def query_commit_objects(
+    commit_shas: List[str], repo: str, commit_fields: str
+) -> Dict[str, Dict[str, object]] | None:
+    """Run one GraphQL query selecting commit_fields for each commit, keyed by SHA.
+
+    Commits GitHub cannot resolve are left out. Returns None (after printing a
+    warning) when the query itself fails.
+    """
+    owner, _, name = repo.partition("/")
+    fields = "\n".join(
+        f'c{idx}: object(oid: "{sha}") {{{commit_fields}}}'
+        for idx, sha in enumerate(commit_shas)
+    )
+    query = (
+        "query($owner: String!, $name: String!) {\n"
+        f"  repository(owner: $owner, name: $name) {{\n{fields}\n  }}\n}}"
+    )
+    try:
+        output = run_command(
+            [
+                "gh",
+                "api",
+                "graphql",
+                "-f",
+                f"query={query}",
+                "-f",
+                f"owner={owner}",
+                "-f",
+                f"name={name}",
+            ]
+        )
+        repository = (parse_json(output).get("data") or {}).get("repository") or {}
+    except subprocess.CalledProcessError as exc:
+        reason = (exc.stderr or "").strip() or f"exit status {exc.returncode}"
+        print(f"Warning: Bulk check query failed, falling back to REST: {reason}")
+        return None
+    except (json.JSONDecodeError, AttributeError) as exc:
+        print(f"Warning: Bulk check query failed, falling back to REST: {exc}")
+        return None
+
+    return {
+        sha: repository[f"c{idx}"]
+        for idx, sha in enumerate(commit_shas)
+        if repository.get(f"c{idx}")
+    }
+
+
+def get_checks_bulk(commit_shas: List[str], repo: str) -> Dict[str, List[Dict[str, str]]]:
+    """Get status check results for many commits with batched GraphQL queries.
+
+    A cheap probe of ``statusCheckRollup`` first finds the commits that have
+    any checks at all; commits without a rollup get an empty list and are not
+    queried further. The rest are listed CHECKS_QUERY_BATCH_SIZE commits per
+    query. Entries are shaped like the REST payloads used by
+    get_commit_checks. Commits that could not be resolved (or whose batch
+    failed) are left out so callers can fall back to the REST endpoints.
+    """
+    checks_by_sha: Dict[str, List[Dict[str, str]]] = {}
+
+    commits_with_checks: List[str] = []
+    for start in range(0, len(commit_shas), CHECKS_PROBE_BATCH_SIZE):
+        batch = commit_shas[start : start + CHECKS_PROBE_BATCH_SIZE]
+        probed = query_commit_objects(batch, repo, CHECKS_PROBE_COMMIT_FIELDS)
+        if probed is None:
+            commits_with_checks.extend(batch)
+            continue
+        for sha in batch:
+            if sha not in probed:
+                continue
+            if probed[sha].get("statusCheckRollup"):
+                commits_with_checks.append(sha)
+            else:
+                checks_by_sha[sha] = []
+
+    for start in range(0, len(commits_with_checks), CHECKS_QUERY_BATCH_SIZE):
+        batch = commits_with_checks[start : start + CHECKS_QUERY_BATCH_SIZE]
+        commits = query_commit_objects(batch, repo, CHECKS_QUERY_COMMIT_FIELDS)
+        if commits is None:
+            continue
+
+        for sha, commit in commits.items():
+            checks: List[Dict[str, str]] = []
+            for suite in (commit.get("checkSuites") or {}).get("nodes") or []:
+                for run in ((suite or {}).get("checkRuns") or {}).get("nodes") or []:
+                    checks.append(
+                        normalize_check_entry(
+                            {
+                                "name": run.get("name"),
+                                "status": (run.get("status") or "").lower(),
+                                "conclusion": (run.get("conclusion") or "").lower(),
+                                "details_url": run.get("detailsUrl"),
+                            },
+                            "check-run",
+                        )
+                    )
+            for context in (commit.get("status") or {}).get("contexts") or []:
+                checks.append(
+                    normalize_check_entry(
+                        {
+                            "context": context.get("context"),
+                            "state": (context.get("state") or "").lower(),
+                            "target_url": context.get("targetUrl"),
+                            "description": context.get("description"),
+                        },
+                        "status",
+                    )
+                )
+            checks_by_sha[sha] = checks
+
+    return checks_by_sha
+
+
 def extract_actions_run_id(details_url: str | None) -> str | None:
     """Extract the GitHub Actions run ID from a details URL."""
     if not details_url:
         return None
-    match = re.search(r"/actions/runs/(\d+)", details_url)
+    match = ACTIONS_RUN_ID_RE.search(details_url)
     return match.group(1) if match else None
 
 
-def get_failed_check_logs(check: Dict[str, str]) -> str | None:
-    """Retrieve raw logs for failed GitHub Actions checks."""
+# Check conclusions that count as passing.
+PASSING_CONCLUSIONS = frozenset({"success", "neutral", "skipped"})
+
+
+def failed_check_run_id(check: Dict[str, str]) -> str | None:
+    """Return the Actions run ID behind a failed check, or None."""
     conclusion = (check.get("conclusion") or "").lower()
-    if conclusion in {"success", "neutral", "skipped"}:
+    if conclusion in PASSING_CONCLUSIONS:
         return None
+    return extract_actions_run_id(check.get("detailsUrl") or "")
 
-    run_id = extract_actions_run_id(check.get("detailsUrl") or "")
-    if not run_id:
-        return None
 
-    try:
-        print(
-            f"Fetching logs for failed check '{check.get('name', 'unknown check')}' "
-            f"(run {run_id})"
-        )
-        return run_command(f"gh run view {shlex.quote(run_id)} --log")
-    except subprocess.CalledProcessError as exc:
+def fetch_run_logs(run_id: str, check_name: str, spool_dir: str) -> str | None:
+    """Download the raw logs for a GitHub Actions run into spool_dir.
+
+    Logs can be large, so they go straight from gh to disk and only the file
+    path is kept; read_spooled_log loads one log at a time when it is written.
+    """
+    print(f"Fetching logs for failed check '{check_name}' (run {run_id})")
+    argv = ["gh", "run", "view", run_id, "--log"]
+    log_path = os.path.join(spool_dir, f"run-{run_id}.log")
+    with open(log_path, "wb") as log_file:
+        result = subprocess.run(argv, stdout=log_file, stderr=subprocess.DEVNULL)
+    if result.returncode != 0:
+        exc = subprocess.CalledProcessError(result.returncode, argv)
         print(f"Warning: Failed to fetch logs for run {run_id}: {exc}")
         return None
+    return log_path
+
+
+def read_spooled_log(log_path: str) -> str:
+    """Read a log written by fetch_run_logs, trimmed of surrounding whitespace."""
+    with open(log_path, "r", encoding="utf-8", errors="replace") as log_file:
+        return log_file.read().strip()
+
+
+def fetch_failed_run_logs(
+    checks_by_sha: Dict[str, List[Dict[str, str]]], spool_dir: str, max_workers: int = 8
+) -> Dict[str, str | None]:
+    """Fetch logs for every failed Actions run once, in parallel, keyed by run ID.
+
+    Several checks (and commits) often point at the same run, so run IDs are
+    collected first and each is downloaded a single time. Values are spooled
+    log paths (see fetch_run_logs), or None when the download failed.
+    """
+    run_names: Dict[str, str] = {}
+    for checks in checks_by_sha.values():
+        for check in checks:
+            run_id = failed_check_run_id(check)
+            if run_id and run_id not in run_names:
+                run_names[run_id] = check.get("name", "unknown check")
+    if not run_names:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(run_names))) as executor:
+        log_paths = executor.map(
+            partial(fetch_run_logs, spool_dir=spool_dir), run_names, run_names.values()
+        )
+        return dict(zip(run_names, log_paths))
 
 
 def checks_all_green(checks: List[Dict[str, str]]) -> bool:
@@ -356,18 +1274,32 @@ def checks_all_green(checks: List[Dict[str, str]]) -> bool:
         return False
     for check in checks:
         conclusion = (check.get("conclusion") or check.get("status") or "").lower()
-        if conclusion not in {"success", "neutral", "skipped"}:
+        if conclusion not in PASSING_CONCLUSIONS:
             return False
     return True
 
 
+EXCLUDED_BASENAMES = frozenset({"package-lock.json"})
+# Pathspecs that leave the same files out of git's own diff output.
+EXCLUDED_PATHSPECS = [f":(exclude,glob)**/{name}" for name in sorted(EXCLUDED_BASENAMES)]
+
+
+def is_excluded_file(file_path: str) -> bool:
+    """Return True for files that should be left out of documents.
+
+    Paths come from git, which always uses ``/``, so the basename is taken
+    with a string split rather than a Path object per file.
+    """
+    return file_path.rpartition("/")[2] in EXCLUDED_BASENAMES
+
+
 def filter_excluded_files(files: List[str]) -> Tuple[List[str], List[str]]:
     """Filter files that should be excluded from documents."""
     excluded_files: List[str] = []
     included_files: List[str] = []
 
     for file_path in files:
-        if Path(file_path).name == "package-lock.json":
+        if is_excluded_file(file_path):
             excluded_files.append(file_path)
         else:
             included_files.append(file_path)
@@ -378,349 +1310,655 @@ def filter_excluded_files(files: List[str]) -> Tuple[List[str], List[str]]:
     return included_files, excluded_files
 
 
+def format_checks_section(checks: List[Dict[str, str]], include_logs: bool) -> str:
+    """Render the checks block that ends a per-commit diff file."""
+    parts = ["\n\n", RULE, f"Checks ({len(checks)}):\n"]
+    if not checks:
+        parts.append("# No checks found\n")
+    else:
+        for check in checks:
+            name = check.get("name") or "unknown check"
+            status = check.get("status") or "unknown"
+            conclusion = check.get("conclusion") or "unknown"
+            details_url = check.get("detailsUrl") or ""
+            log_path = check.get("logOutputPath")
+            heading = f"- {name}: status={status}, conclusion={conclusion}"
+            if details_url:
+                heading += f" [{details_url}]"
+            parts.append(heading + "\n")
+
+            summary = check.get("summary") or check.get("title") or ""
+            if summary:
+                parts.extend(f"    {line}\n" for line in summary.splitlines())
+            log_output = read_spooled_log(log_path) if include_logs and log_path else ""
+            if log_output:
+                parts.append("    Logs:\n")
+                parts.extend(f"    {line}\n" for line in log_output.splitlines())
+    parts.append("\n")
+    return "".join(parts)
+
+
 def run_commit_big_picture(
     commit_info: Dict[str, str],
     files: List[str],
+    diff_output: str,
     checks: List[Dict[str, str]],
+    checks_with_logs: List[Dict[str, str]] | None,
     output_file: str,
-    include_logs: bool = False,
+    output_file_with_logs: str | None,
+    master: BinaryIO | None = None,
+    master_with_logs: BinaryIO | None = None,
 ) -> bool:
-    """Generate a git diff compilation for a commit."""
+    """Generate the without-logs and with-logs diff compilations for a commit.
+
+    Both files share the header and diff, which are written once through a
+    tee; only the checks section differs. When the masters are given, each
+    file's content is also written to its master comparison, so the masters
+    never re-read commit files. The with-logs file is skipped when
+    output_file_with_logs is None.
+    """
     commit_sha = commit_info["sha"]
-    print(f"Creating diff compilation for commit {commit_info['short']}...")
+    print(f"Creating diff compilations for commit {commit_info['short']}...")
 
     if not files:
         print(f"Warning: No files found for commit {commit_info['short']}")
         return False
 
-    files_arg = " ".join(shlex.quote(f) for f in files)
-    diff_output = run_command(
-        f"git show --pretty=format: {shlex.quote(commit_sha)} -- {files_arg}"
-    )
-
     body_text = " ".join(commit_info.get("body", "").split()) or "(no body provided)"
     summary_text = " ".join(commit_info.get("subject", "").split()) or "(no subject)"
     checks_green = checks_all_green(checks)
 
-    with open(output_file, "w", encoding="utf-8") as diff_file:
-        diff_file.write(f"# Commit {commit_info['short']}: {summary_text}\n")
-        diff_file.write(f"# SHA: {commit_sha}\n")
-        diff_file.write(f"# Author: {commit_info.get('author', 'unknown')} <{commit_info.get('email', '')}>\n")
-        diff_file.write(f"# Date: {commit_info.get('date', '')}\n")
-        diff_file.write(f"# URL: {commit_info.get('url', '')}\n")
-        diff_file.write(f"# Body: {body_text}\n")
-        diff_file.write(f"# Checks green: {checks_green}\n")
-        diff_file.write(f"# Changed files: {len(files)}\n")
-        diff_file.write(f"# Files: {', '.join(files)}\n\n")
-        diff_file.write("=" * 80 + "\n")
-        diff_file.write(diff_output if diff_output else "# No differences found\n")
-        diff_file.write("\n\n")
-        diff_file.write("=" * 80 + "\n")
-        diff_file.write(f"Checks ({len(checks)}):\n")
-
-        if not checks:
-            diff_file.write("# No checks found\n")
-        else:
-            for check in checks:
-                name = check.get("name") or "unknown check"
-                status = check.get("status") or "unknown"
-                conclusion = check.get("conclusion") or "unknown"
-                details_url = check.get("detailsUrl") or ""
-                log_output = check.get("logOutput") or ""
-                heading = f"- {name}: status={status}, conclusion={conclusion}"
-                if details_url:
-                    heading += f" [{details_url}]"
-                diff_file.write(heading + "\n")
-
-                summary = check.get("summary") or check.get("title") or ""
-                if summary:
-                    for line in summary.splitlines():
-                        diff_file.write(f"    {line}\n")
-                if include_logs and log_output:
-                    diff_file.write("    Logs:\n")
-                    for line in log_output.splitlines():
-                        diff_file.write(f"    {line}\n")
-
-        diff_file.write("\n")
+    header = "".join(
+        [
+            f"# Commit {commit_info['short']}: {summary_text}\n",
+            f"# SHA: {commit_sha}\n",
+            f"# Author: {commit_info.get('author', 'unknown')} <{commit_info.get('email', '')}>\n",
+            f"# Date: {commit_info.get('date', '')}\n",
+            f"# URL: {commit_info.get('url', '')}\n",
+            f"# Body: {body_text}\n",
+            f"# Checks green: {checks_green}\n",
+            f"# Changed files: {len(files)}\n",
+            f"# Files: {', '.join(files)}\n\n",
+            RULE,
+        ]
+    )
+
+    with ExitStack() as stack:
+        commit_file = stack.enter_context(open_output(output_file))
+        commit_file_with_logs = None
+        if output_file_with_logs is not None:
+            commit_file_with_logs = stack.enter_context(open_output(output_file_with_logs))
+        plain = TeeWriter([out for out in (commit_file, master) if out])
+        with_logs = TeeWriter([out for out in (commit_file_with_logs, master_with_logs) if out])
+        shared = TeeWriter(plain.outputs + with_logs.outputs)
+
+        write_text(shared, header)
+        write_text(shared, diff_output if diff_output else "# No differences found\n")
+        write_text(plain, format_checks_section(checks, include_logs=False))
+        if commit_file_with_logs is not None:
+            write_text(with_logs, format_checks_section(checks_with_logs or [], include_logs=True))
 
     print(f"✓ Created diff: {output_file}")
+    if output_file_with_logs is not None:
+        print(f"✓ Created diff: {output_file_with_logs}")
     return True
 
 
-def create_master_comparison(
-    commit_files: List[Tuple[Dict[str, str], str]],
-    selection_requested: str,
-    selection_canonical: str,
-    selected_commits: List[str],
-    output_file: str,
-    include_logs: bool = False,
-) -> bool:
-    """Create a master comparison file combining all individual commit diff files."""
-    print("Creating master comparison file...")
+def compilation_header(title: str, selection_header: str, total_commits: int) -> str:
+    """Build the header block shared by the compilation outputs.
 
-    if not commit_files:
-        print("Warning: No individual commit files found for master comparison")
-        return False
+    selection_header is the rendered selection_header_lines block, built once
+    per run and shared by every output.
+    """
+    return (
+        f"{title}\n"
+        + selection_header
+        + f"# Total commits: {total_commits}\n"
+        + f"# Generated: {generated_timestamp()}\n"
+        + RULE
+        + "\n"
+    )
 
-    with open(output_file, "w", encoding="utf-8") as outf:
-        log_note = " (with logs)" if include_logs else ""
-        outf.write(f"# Master Comparison{log_note}\n")
-        for line in selection_header_lines(
-            selection_requested, selection_canonical, selected_commits
-        ):
-            outf.write(f"{line}\n")
-        outf.write(f"# Total commits: {len(commit_files)}\n")
-        outf.write(f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        outf.write("=" * 80 + "\n\n")
-
-        for idx, (commit_info, commit_file) in enumerate(commit_files, 1):
-            outf.write("\n" + "=" * 80 + "\n")
-            outf.write(
-                f"# Commit {idx}/{len(commit_files)} - {commit_info['short']}: "
-                f"{commit_info.get('subject', '')}\n"
-            )
-            outf.write("=" * 80 + "\n\n")
 
-            with open(commit_file, "r", encoding="utf-8") as inf:
-                outf.write(inf.read())
+def append_file(outf: BinaryIO, path: str) -> None:
+    """Append the raw bytes of path to outf, copying inside the kernel when possible."""
+    outf.flush()
+    with open(path, "rb") as inf:
+        remaining = os.fstat(inf.fileno()).st_size
+        offset = 0
+        try:
+            while remaining > 0:
+                sent = os.sendfile(outf.fileno(), inf.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        except (AttributeError, OSError):
+            # os.sendfile is missing or refuses regular files on some
+            # platforms; fall back to a user-space copy from where it stopped.
+            inf.seek(offset)
+            shutil.copyfileobj(inf, outf, OUTPUT_BUFFER_SIZE)
+
+
+def write_master_heading(
+    outf: BinaryIO, idx: int, total: int, commit_info: Dict[str, str]
+) -> None:
+    """Write the heading that precedes one commit in the master comparison."""
+    outf.write(b"\n" + RULE_BYTES)
+    write_text(
+        outf,
+        f"# Commit {idx}/{total} - {commit_info['short']}: "
+        f"{commit_info.get('subject', '')}\n",
+    )
+    outf.write(RULE_BYTES + b"\n")
+
 
-            outf.write("\n\n")
+def format_summary_entry(
+    idx: int, total: int, commit_info: Dict[str, str], commit_file: str
+) -> str:
+    """Render one commit's entry in the summary compilation."""
+    summary_text = " ".join(commit_info.get("subject", "").split()) or "(no subject)"
+    body_text = " ".join(commit_info.get("body", "").split()) or "(no body provided)"
 
-    print(f"✓ Created master comparison: {output_file}")
-    return True
+    return (
+        f"## Commit {idx}/{total} - {commit_info['short']}: {summary_text}\n"
+        f"- SHA: {commit_info.get('sha', '')}\n"
+        f"- Author: {commit_info.get('author', 'unknown')}\n"
+        f"- Date: {commit_info.get('date', '')}\n"
+        f"- URL: {commit_info.get('url', '')}\n"
+        f"- Body: {body_text}\n"
+        f"- Detailed file: {commit_file}\n"
+        "\n"
+    )
 
 
-def get_commit_parent(commit_sha: str) -> str | None:
-    output = run_command(
-        f"git rev-list --parents -n 1 {shlex.quote(commit_sha)}"
+def write_touched_entry(
+    outf: BinaryIO,
+    commit_info: Dict[str, str],
+    parent: str | None,
+    file_statuses: Dict[str, str],
+    cat_file: CatFileBatch,
+    snapshot_cache: SnapshotCache | None = None,
+    file_diffs: Dict[str, str] | None = None,
+) -> None:
+    """Write one commit's before/after snapshots and per-file diffs.
+
+    file_diffs holds the per-file diffs from iter_file_diffs; without it
+    each file is diffed with its own git show. So are paths containing a
+    newline, which git log --stdin cannot take as pathspecs.
+    """
+    commit_sha = commit_info["sha"]
+    commit_short = commit_info["short"]
+    subject = commit_info.get("subject", "")
+    files, _excluded = filter_excluded_files(list(file_statuses))
+    if not files:
+        return
+
+    write_text(
+        outf,
+        "".join(
+            [
+                RULE,
+                f"# Commit {commit_short}: {subject}\n",
+                f"# SHA: {commit_sha}\n",
+                f"# Parent: {parent or '(none)'}\n",
+                f"# Files: {', '.join(files)}\n",
+                RULE + "\n",
+            ]
+        ),
     )
-    parts = output.split()
-    if len(parts) <= 1:
-        return None
-    return parts[1]
 
+    for file_path in files:
+        status = file_statuses.get(file_path, "M")
+        file_header = (
+            THIN_RULE
+            + f"# File: {file_path}\n"
+            f"# Commit: {commit_short}\n\n"
+            "# Before\n"
+        )
 
-def create_touched_files_compilation(
+        before_binary = False
+        if not parent:
+            write_text(outf, file_header + "# (no parent commit)\n")
+        elif status == "A":
+            write_text(outf, file_header + "# (file did not exist before commit)\n")
+        else:
+            write_text(outf, file_header)
+            before_binary = write_file_snapshot(
+                outf,
+                cat_file,
+                parent,
+                file_path,
+                "# (file did not exist before commit)",
+                snapshot_cache,
+            )
+
+        after_binary = False
+        if status == "D":
+            write_text(outf, "\n# After\n# (file removed in commit)\n")
+        else:
+            write_text(outf, "\n# After\n")
+            after_binary = write_file_snapshot(
+                outf,
+                cat_file,
+                commit_sha,
+                file_path,
+                "# (file removed in commit)",
+                snapshot_cache,
+            )
+
+        if before_binary or after_binary:
+            print(f"Skipping binary file contents for {file_path} in commit {commit_short}")
+
+        if file_diffs is None or "\n" in file_path:
+            diff_output = run_command(
+                ["git", "show", "--root", "--pretty=format:", commit_sha, "--", file_path]
+            )
+        else:
+            diff_output = file_diffs.get(file_path, "")
+
+        write_text(
+            outf,
+            "\n# Diff\n"
+            + (diff_output if diff_output else "# No differences found\n")
+            + "\n\n",
+        )
+
+
+def emit_all_outputs(
     commits: List[Dict[str, str]],
-    selection_requested: str,
-    selection_canonical: str,
-    selected_commits: List[str],
-    output_file: str,
-    master_comparison_file: str | None = None,
-    include_logs: bool = False,
-) -> bool:
-    """Create a compilation of touched files with before/after snapshots."""
-    print("Creating touched files compilation...")
+    variants: List[Dict[str, object]],
+    selection_header: str,
+    parents: Dict[str, str | None],
+    changed_files: Dict[str, Dict[str, str]],
+    cat_file: CatFileBatch,
+) -> None:
+    """Write the summary and touched files outputs in one pass over the commits.
+
+    Each variant (without logs / with logs) is a dict with ``commit_files``,
+    ``include_logs``, ``master_output``, ``summary_output`` and
+    ``touched_output``. The touched-files snapshots are identical across
+    variants, so every blob is read once and teed into all touched outputs;
+    a SnapshotCache lets a commit's "before" reuse its parent's "after".
+    The finished master comparison is appended to each touched output.
+    All outputs are written incrementally through large buffers.
+    """
+    variants = [variant for variant in variants if variant["commit_files"]]
+    if not variants:
+        return
+
+    print("Creating summary and touched files compilations...")
+
+    with ExitStack() as stack:
+        summaries = []
+        touched_files = []
+        entry_maps = []
+        for variant in variants:
+            commit_files = variant["commit_files"]
+            log_note = " (with logs)" if variant["include_logs"] else ""
+
+            summary = stack.enter_context(open_output(variant["summary_output"]))
+            write_text(
+                summary,
+                compilation_header(
+                    f"# Commit Summary Compilation{log_note}", selection_header, len(commit_files)
+                ),
+            )
+            touched = stack.enter_context(open_output(variant["touched_output"]))
+            write_text(
+                touched,
+                compilation_header(
+                    f"# Touched Files{log_note} (commit snapshots)", selection_header, len(commits)
+                ),
+            )
 
-    if not commits:
-        print("Warning: No commits available for compilation")
-        return False
+            summaries.append(summary)
+            touched_files.append(touched)
+            entry_maps.append(
+                {
+                    info["sha"]: (idx, info, commit_file)
+                    for idx, (info, commit_file) in enumerate(commit_files, 1)
+                }
+            )
 
-    with open(output_file, "w", encoding="utf-8") as outf:
-        log_note = " (with logs)" if include_logs else ""
-        outf.write(f"# Touched Files{log_note} (commit snapshots)\n")
-        for line in selection_header_lines(
-            selection_requested, selection_canonical, selected_commits
-        ):
-            outf.write(f"{line}\n")
-        outf.write(f"# Total commits: {len(commits)}\n")
-        outf.write(f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        outf.write("=" * 80 + "\n\n")
+        touched_tee = TeeWriter(touched_files)
+        snapshot_cache = SnapshotCache()
+        touched_paths: Dict[str, None] = {}
+        diffed_shas: Dict[str, None] = {}
+        for commit_info in commits:
+            commit_sha = commit_info["sha"]
+            included = [
+                path
+                for path in changed_files.get(commit_sha, {})
+                if not is_excluded_file(path) and "\n" not in path
+            ]
+            if included:
+                diffed_shas[commit_sha] = None
+                touched_paths.update(dict.fromkeys(included))
+        # One git log covers every per-file diff; commits come back in order.
+        file_diffs = iter_file_diffs(list(diffed_shas), list(touched_paths))
 
         for commit_info in commits:
             commit_sha = commit_info["sha"]
-            commit_short = commit_info["short"]
-            subject = commit_info.get("subject", "")
-            parent = get_commit_parent(commit_sha)
-            files = get_commit_changed_files(commit_sha)
-            files, _excluded = filter_excluded_files(files)
-            if not files:
-                continue
+            for variant, summary, entries in zip(variants, summaries, entry_maps):
+                entry = entries.get(commit_sha)
+                if entry is None:
+                    continue
+                idx, info, commit_file = entry
+                write_text(
+                    summary,
+                    format_summary_entry(idx, len(variant["commit_files"]), info, commit_file),
+                )
 
-            outf.write("=" * 80 + "\n")
-            outf.write(f"# Commit {commit_short}: {subject}\n")
-            outf.write(f"# SHA: {commit_sha}\n")
-            outf.write(f"# Parent: {parent or '(none)'}\n")
-            outf.write(f"# Files: {', '.join(files)}\n")
-            outf.write("=" * 80 + "\n\n")
-
-            for file_path in files:
-                outf.write("-" * 80 + "\n")
-                outf.write(f"# File: {file_path}\n")
-                outf.write(f"# Commit: {commit_short}\n\n")
-
-                before_binary = False
-                if parent:
-                    try:
-                        before_raw = run_command_bytes(
-                            f"git show {shlex.quote(parent)}:{shlex.quote(file_path)}"
-                        )
-                        before_contents, before_binary = decode_file_snapshot(before_raw)
-                    except subprocess.CalledProcessError:
-                        before_contents = "# (file did not exist before commit)"
-                else:
-                    before_contents = "# (no parent commit)"
-
-                after_binary = False
-                try:
-                    after_raw = run_command_bytes(
-                        f"git show {shlex.quote(commit_sha)}:{shlex.quote(file_path)}"
-                    )
-                    after_contents, after_binary = decode_file_snapshot(after_raw)
-                except subprocess.CalledProcessError:
-                    after_contents = "# (file removed in commit)"
+            commit_diffs = None
+            if commit_sha in diffed_shas:
+                _sha, commit_diffs = next(file_diffs)
+            write_touched_entry(
+                touched_tee,
+                commit_info,
+                parents.get(commit_sha),
+                changed_files.get(commit_sha, {}),
+                cat_file,
+                snapshot_cache,
+                commit_diffs,
+            )
 
-                if before_binary or after_binary:
-                    print(
-                        f"Skipping binary file contents for {file_path} in commit {commit_short}"
-                    )
+        for variant, touched in zip(variants, touched_files):
+            touched.write(RULE_BYTES)
+            write_text(touched, "# Appended master comparison (diffs and summaries)\n\n")
+            append_file(touched, variant["master_output"])
 
-                diff_output = run_command(
-                    f"git show --pretty=format: {shlex.quote(commit_sha)} -- {shlex.quote(file_path)}"
-                )
+    for variant in variants:
+        log_note = " (with logs)" if variant["include_logs"] else ""
+        print(f"✓ Created summary compilation{log_note}: {variant['summary_output']}")
+        print(f"✓ Created touched files compilation{log_note}: {variant['touched_output']}")
 
-                outf.write("# Before\n")
-                outf.write(before_contents)
-                if not before_contents.endswith("\n"):
-                    outf.write("\n")
-                outf.write("\n# After\n")
-                outf.write(after_contents)
-                if not after_contents.endswith("\n"):
-                    outf.write("\n")
-                outf.write("\n# Diff\n")
-                outf.write(diff_output if diff_output else "# No differences found\n")
-                outf.write("\n\n")
-
-        if master_comparison_file and os.path.exists(master_comparison_file):
-            outf.write("=" * 80 + "\n")
-            outf.write("# Appended master comparison (diffs and summaries)\n\n")
-            with open(master_comparison_file, "r", encoding="utf-8") as master_file:
-                outf.write(master_file.read())
-
-    print(f"✓ Created touched files compilation: {output_file}")
-    return True
 
+def write_round_robin_pair(
+    left: Dict[str, object],
+    right: Dict[str, object],
+    output_dir: str,
+    selection_header: str,
+) -> str | None:
+    """Write the comparison file for one pair of commits; return its path.
+
+    Returns None when either entry is malformed. Safe to run from worker
+    threads: it only runs git diff and writes its own output file.
+    """
+    left_info = left["info"]
+    right_info = right["info"]
+    left_sha = left_info.get("sha")
+    right_sha = right_info.get("sha")
+    left_files = left["files"]
+    right_files = right["files"]
+
+    if not isinstance(left_sha, str) or not isinstance(right_sha, str):
+        return None
+    if not isinstance(left_files, list) or not isinstance(right_files, list):
+        return None
 
-def create_summary_compilation(
-    commit_files: List[Tuple[Dict[str, str], str]],
-    selection_requested: str,
-    selection_canonical: str,
-    selected_commits: List[str],
-    output_file: str,
-    include_logs: bool = False,
-) -> bool:
-    """Create a concise summary document for all processed commits."""
-    print("Creating summary compilation file...")
+    output_file = os.path.join(
+        output_dir, f"commit-{left_sha[:8]}-versus-{right_sha[:8]}.txt"
+    )
 
-    if not commit_files:
-        print("Warning: No commits available to summarize")
-        return False
+    combined_files = sorted(set(left_files) | set(right_files))
+    diff_cmd = ["git", "diff", left_sha, right_sha]
+    if combined_files:
+        diff_cmd += ["--", *combined_files]
 
-    with open(output_file, "w", encoding="utf-8") as outf:
-        log_note = " (with logs)" if include_logs else ""
-        outf.write(f"# Commit Summary Compilation{log_note}\n")
-        for line in selection_header_lines(
-            selection_requested, selection_canonical, selected_commits
-        ):
-            outf.write(f"{line}\n")
-        outf.write(f"# Total commits: {len(commit_files)}\n")
-        outf.write(f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        outf.write("=" * 80 + "\n\n")
-
-        for idx, (commit_info, commit_file) in enumerate(commit_files, 1):
-            summary_text = " ".join(commit_info.get("subject", "").split()) or "(no subject)"
-            body_text = " ".join(commit_info.get("body", "").split()) or "(no body provided)"
-
-            outf.write(
-                f"## Commit {idx}/{len(commit_files)} - {commit_info['short']}: {summary_text}\n"
-            )
-            outf.write(f"- SHA: {commit_info.get('sha', '')}\n")
-            outf.write(f"- Author: {commit_info.get('author', 'unknown')}\n")
-            outf.write(f"- Date: {commit_info.get('date', '')}\n")
-            outf.write(f"- URL: {commit_info.get('url', '')}\n")
-            outf.write(f"- Body: {body_text}\n")
-            outf.write(f"- Detailed file: {commit_file}\n")
-            outf.write("\n")
-
-    print(f"✓ Created summary compilation: {output_file}")
-    return True
+    diff_output = run_command(diff_cmd)
+
+    left_summary = " ".join(left_info.get("subject", "").split()) or "(no subject)"
+    right_summary = " ".join(right_info.get("subject", "").split()) or "(no subject)"
+
+    with open_output(output_file) as outf:
+        write_text(
+            outf,
+            f"# Commit {left_sha[:8]} vs {right_sha[:8]}: "
+            f"{left_summary} ↔ {right_summary}\n",
+        )
+        write_text(outf, selection_header)
+        write_text(outf, f"# Generated: {generated_timestamp()}\n")
+        write_text(outf, f"# Left SHA: {left_sha}\n")
+        write_text(outf, f"# Right SHA: {right_sha}\n")
+        write_text(outf, f"# Left author: {left_info.get('author', 'unknown')}\n")
+        write_text(outf, f"# Right author: {right_info.get('author', 'unknown')}\n")
+        write_text(outf, f"# Left URL: {left_info.get('url', '')}\n")
+        write_text(outf, f"# Right URL: {right_info.get('url', '')}\n")
+        write_text(outf, f"# Left summary: {left_summary}\n")
+        write_text(outf, f"# Right summary: {right_summary}\n")
+        write_text(outf, f"# Files compared: {len(combined_files)}\n")
+        write_text(outf, f"# Files: {', '.join(combined_files)}\n\n")
+        outf.write(RULE_BYTES)
+        write_text(outf, diff_output if diff_output else "# No differences found\n")
+        write_text(outf, "\n\n")
+
+    return output_file
 
 
 def create_round_robin_comparisons(
     processed_commits: List[Dict[str, object]],
     output_dir: str,
-    selection_requested: str,
+    selection_header: str,
     selection_canonical: str,
-    selected_commits: List[str],
+    max_workers: int = 8,
 ) -> List[str]:
-    """Create pairwise comparison files for every commit combination."""
+    """Create pairwise comparison files for every commit combination.
+
+    Pairs are independent, so their git diffs run on a thread pool; the
+    returned paths keep the combinations() order.
+    """
     print("Creating round-robin comparisons...")
 
     if len(processed_commits) < 2:
         print("Warning: Not enough commits for round-robin comparisons")
         return []
 
-    output_files: List[str] = []
+    pairs = list(combinations(processed_commits, 2))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+        written = executor.map(
+            partial(
+                write_round_robin_pair,
+                output_dir=output_dir,
+                selection_header=selection_header,
+            ),
+            [left for left, _right in pairs],
+            [right for _left, right in pairs],
+        )
+        output_files = [output_file for output_file in written if output_file]
 
-    for left, right in combinations(processed_commits, 2):
-        left_info = left["info"]
-        right_info = right["info"]
-        left_sha = left_info.get("sha")
-        right_sha = right_info.get("sha")
-        left_files = left["files"]
-        right_files = right["files"]
+    print(
+        f"✓ Created {len(output_files)} round-robin comparison file(s) "
+        f"for selection {selection_canonical}"
+    )
+    return output_files
 
-        if not isinstance(left_sha, str) or not isinstance(right_sha, str):
-            continue
-        if not isinstance(left_files, list) or not isinstance(right_files, list):
-            continue
 
-        output_file = os.path.join(
-            output_dir, f"commit-{left_sha[:8]}-versus-{right_sha[:8]}.txt"
-        )
+# Commits prepared ahead of the writer, per worker thread.
+PREPARE_WINDOW_PER_WORKER = 4
 
-        combined_files = sorted(set(left_files) | set(right_files))
-        files_arg = " ".join(shlex.quote(f) for f in combined_files)
-        diff_cmd = f"git diff {shlex.quote(left_sha)} {shlex.quote(right_sha)}"
-        if files_arg:
-            diff_cmd += f" -- {files_arg}"
 
-        diff_output = run_command(diff_cmd)
+def bounded_map(
+    executor: Executor, fn: Callable[..., object], *iterables: Iterable[object], window: int
+) -> Iterator[object]:
+    """Like executor.map, but with at most window calls submitted at a time.
 
-        left_summary = " ".join(left_info.get("subject", "").split()) or "(no subject)"
-        right_summary = " ".join(right_info.get("subject", "").split()) or "(no subject)"
+    Results come back in input order as soon as each is ready, so the
+    caller's writes overlap the remaining work while only window results
+    are held in memory.
+    """
+    pending: Deque[Future] = deque()
+    for args in zip(*iterables):
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, *args))
+    while pending:
+        yield pending.popleft().result()
 
-        with open(output_file, "w", encoding="utf-8") as outf:
-            outf.write(
-                f"# Commit {left_sha[:8]} vs {right_sha[:8]}: "
-                f"{left_summary} ↔ {right_summary}\n"
-            )
-            for line in selection_header_lines(
-                selection_requested, selection_canonical, selected_commits
-            ):
-                outf.write(f"{line}\n")
-            outf.write(f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            outf.write(f"# Left SHA: {left_sha}\n")
-            outf.write(f"# Right SHA: {right_sha}\n")
-            outf.write(f"# Left author: {left_info.get('author', 'unknown')}\n")
-            outf.write(f"# Right author: {right_info.get('author', 'unknown')}\n")
-            outf.write(f"# Left URL: {left_info.get('url', '')}\n")
-            outf.write(f"# Right URL: {right_info.get('url', '')}\n")
-            outf.write(f"# Left summary: {left_summary}\n")
-            outf.write(f"# Right summary: {right_summary}\n")
-            outf.write(f"# Files compared: {len(combined_files)}\n")
-            outf.write(f"# Files: {', '.join(combined_files)}\n\n")
-            outf.write("=" * 80 + "\n")
-            outf.write(diff_output if diff_output else "# No differences found\n")
-            outf.write("\n\n")
-
-        output_files.append(output_file)
+
+def prepare_commit(
+    commit_info: Dict[str, str],
+    files: List[str],
+    checks: List[Dict[str, str]] | None,
+    repo_name: str,
+    logs_by_run: Dict[str, str | None],
+    spool_dir: str,
+    collect_logs: bool = True,
+) -> Dict[str, object] | None:
+    """Collect the checks and failed-check logs for one commit.
+
+    checks come from get_checks_bulk; None means they still need fetching.
+    logs_by_run holds log paths already spooled by fetch_failed_run_logs;
+    logs for REST-fallback checks are spooled into spool_dir here. With
+    collect_logs off, no logs are fetched and checks_with_logs is None.
+    Returns None when the commit has nothing to report; the diff is filled
+    in later from iter_commit_diffs. Safe to run from worker threads: it
+    only runs gh commands.
+    """
+    print(f"\n--- Processing commit {commit_info['short']}: {commit_info['subject']} ---")
+
+    if not files:
+        print(f"No changed files found for commit {commit_info['short']}")
+        return None
+
+    print(f"Total changed files: {len(files)}")
+
+    included_files, _excluded_files = filter_excluded_files(files)
+    if not included_files:
+        print(
+            f"No files to process for commit {commit_info['short']} "
+            "(all files were excluded)"
+        )
+        return None
 
     print(
-        f"✓ Created {len(output_files)} round-robin comparison file(s) "
-        f"for selection {selection_canonical}"
+        f"Files to process ({len(included_files)}): "
+        f"{', '.join(included_files)}"
     )
-    return output_files
+
+    checks_with_logs: List[Dict[str, str]] | None = [] if collect_logs else None
+    try:
+        if checks is None:
+            checks = get_commit_checks(commit_info["sha"], repo_name)
+    except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as exc:
+        print(f"Failed to retrieve checks for commit {commit_info['short']}: {exc}")
+        checks = []
+    if checks_with_logs is not None:
+        # Checks from the REST fallback were not covered by the up-front
+        # fetch; download their runs concurrently before attaching logs.
+        unfetched = [check for check in checks if failed_check_run_id(check) not in logs_by_run]
+        if unfetched:
+            logs_by_run = {
+                **logs_by_run,
+                **fetch_failed_run_logs({commit_info["sha"]: unfetched}, spool_dir),
+            }
+        for check in checks:
+            check_copy = dict(check)
+            log_path = logs_by_run.get(failed_check_run_id(check_copy))
+            if log_path:
+                check_copy["logOutputPath"] = log_path
+            checks_with_logs.append(check_copy)
+
+    return {
+        "info": commit_info,
+        "files": included_files,
+        "checks": checks,
+        "checks_with_logs": checks_with_logs,
+    }
+
+
+def write_commit_reports(
+    prepared: Dict[str, object],
+    output_dir: str,
+    idx: int,
+    total: int,
+    masters: Dict[bool, BinaryIO],
+) -> Tuple[Dict[str, object] | None, Dict[str, object] | None]:
+    """Write the per-commit diff files for one prepared commit.
+
+    Each file is teed into the matching master comparison (keyed by
+    include_logs) under its "Commit idx/total" heading. Returns the processed
+    entries for the without-logs and with-logs outputs; both are None when
+    nothing was written, and the with-logs one is None when logs were not
+    collected.
+    """
+    commit_info = prepared["info"]
+    included_files = prepared["files"]
+    collect_logs = prepared["checks_with_logs"] is not None
+    output_file = os.path.join(
+        output_dir, f"commit-{commit_info['short']}-implementation.txt"
+    )
+    output_file_with_logs = (
+        os.path.join(output_dir, f"commit-{commit_info['short']}-implementation-with-logs.txt")
+        if collect_logs
+        else None
+    )
+
+    for master in masters.values():
+        write_master_heading(master, idx, total, commit_info)
+    written = run_commit_big_picture(
+        commit_info,
+        included_files,
+        prepared["diff"],
+        prepared["checks"],
+        prepared["checks_with_logs"],
+        output_file,
+        output_file_with_logs,
+        master=masters.get(False),
+        master_with_logs=masters.get(True),
+    )
+    for master in masters.values():
+        write_text(master, "\n\n")
+
+    if not written:
+        return None, None
+    processed = {"info": commit_info, "file": output_file, "files": included_files}
+    if not collect_logs:
+        return processed, None
+    return processed, {"info": commit_info, "file": output_file_with_logs, "files": included_files}
+
+
+def outputs_up_to_date(paths: List[str], commit_shas: List[str]) -> bool:
+    """Return True when every path exists and is newer than every commit.
+
+    Commit times are committer dates, read with one git log call.
+    """
+    if not commit_shas:
+        return False
+    try:
+        oldest_output = min(os.path.getmtime(path) for path in paths)
+        commit_times = run_command(
+            ["git", "log", "--no-walk=unsorted", "--stdin", "--format=%ct"],
+            input=git_log_stdin(commit_shas),
+        ).split()
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return bool(commit_times) and oldest_output >= max(int(ct) for ct in commit_times)
+
+
+def stdout_closed() -> bool:
+    """Return True if stdout is a pipe whose reader has gone away.
+
+    BrokenPipeError can also come from a child process's pipe; only a broken
+    stdout should be treated as the reader closing early. Without poll()
+    (Windows) stdout is assumed to be the broken stream.
+    """
+    if not hasattr(select, "poll"):
+        return True
+    poller = select.poll()
+    poller.register(sys.stdout.fileno(), select.POLLOUT)
+    return any(events & select.POLLERR for _fd, events in poller.poll(0))
+
+
+def discard_stdout() -> None:
+    """Point stdout at /dev/null after its reader went away (e.g. piped into head).
+
+    Later prints, and the final flush at exit, then succeed instead of
+    raising BrokenPipeError again, so cleanup can still run.
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
 
 
 def main() -> None:
@@ -759,16 +1997,73 @@ def main() -> None:
         default="/tmp",
         help="Directory where output files will be written (default: /tmp)",
     )
+    # Commits are read from the object database and the working tree never
+    # leaves the base branch, so there is nothing to clean up; the flag is
+    # still accepted so existing invocations keep working.
     parser.add_argument(
         "--no-cleanup",
         action="store_true",
-        help="Don't return to the base branch at the end",
+        help=argparse.SUPPRESS,
+    )
+    parser.add_argument(
+        "--no-logs",
+        action="store_true",
+        help=(
+            "Skip fetching failed-check logs and writing the with-logs outputs"
+        ),
+    )
+    parser.add_argument(
+        "--skip-up-to-date",
+        action="store_true",
+        help=(
+            "Exit early when the master, summary and touched outputs for this "
+            "selection already exist and are newer than every selected commit "
+            "(check results are not refreshed)"
+        ),
+    )
+    parser.add_argument(
+        "--write-commit-graph",
+        action="store_true",
+        help=(
+            "Write a commit-graph with changed-path filters before expanding "
+            "the selection (speeds up ranges over long histories)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-db",
+        help=(
+            "SQLite file for reusing commit metadata and diffs across runs "
+            "(default: no cache)"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=16,
+        help=(
+            "Maximum concurrent git/gh workers for per-commit processing, "
+            "log downloads, and round-robin diffs (default: 16)"
+        ),
+    )
+    parser.add_argument(
+        "--spool-dir",
+        help=(
+            "Directory for the temporary failed-check log spool, e.g. a tmpfs "
+            "such as /dev/shm (default: the system temp directory)"
+        ),
     )
 
     args = parser.parse_args()
 
     if not args.commit_selection:
         parser.error("commit_selection is required (e.g. 'abc123,def456').")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+    if args.spool_dir and not os.path.isdir(args.spool_dir):
+        parser.error(f"--spool-dir {args.spool_dir} is not a directory.")
+
+    if args.write_commit_graph:
+        write_commit_graph()
 
     try:
         selected_commits = parse_commit_selection(args.commit_selection)
@@ -777,19 +2072,40 @@ def main() -> None:
 
     selection_requested = args.commit_selection
     selection_canonical = format_commit_selection(selected_commits)
-    selection_tag = build_selection_tag(selected_commits, selection_canonical)
+    short_shas = short_commit_shas(selected_commits)
+    selection_tag = build_selection_tag(selected_commits, selection_canonical, short_shas)
+    # Every compilation and round-robin file repeats the same selection block.
+    selection_header = "".join(
+        f"{line}\n"
+        for line in selection_header_lines(
+            selection_requested, selection_canonical, selected_commits, short_shas
+        )
+    )
 
     print(f"Requested commit selection: {selection_requested}")
     print(f"Canonical commit selection: {selection_canonical}")
     if selected_commits:
-        preview = format_commit_list_preview(selected_commits)
+        preview = format_commit_list_preview(selected_commits, short_shas=short_shas)
         print(
             f"Expanded commits: count={len(selected_commits)} "
-            f"first={selected_commits[0][:8]} last={selected_commits[-1][:8]} preview={preview}"
+            f"first={short_shas[0]} last={short_shas[-1]} preview={preview}"
         )
 
+    outputs = compilation_output_paths(args.output_dir, selection_tag, False)
+    outputs_with_logs = compilation_output_paths(args.output_dir, selection_tag, True)
+    if args.skip_up_to_date:
+        expected_outputs = list(outputs.values())
+        if not args.no_logs:
+            expected_outputs.extend(outputs_with_logs.values())
+        if outputs_up_to_date(expected_outputs, selected_commits):
+            print("✓ Outputs are up to date; nothing to do")
+            return
+
     check_current_branch(args.base_branch)
 
+    cat_file = CatFileBatch()
+    log_spool = tempfile.TemporaryDirectory(prefix="commit-batch-logs-", dir=args.spool_dir)
+    cache = CommitCache(args.cache_db) if args.cache_db else None
     try:
         fetch_remote_branches(args.remote)
 
@@ -800,97 +2116,134 @@ def main() -> None:
         commit_infos: List[Dict[str, str]] = []
         missing_commits: List[str] = []
 
+        try:
+            commit_index = load_commit_index(selected_commits, repo_url, cache)
+        except (subprocess.CalledProcessError, ValueError) as exc:
+            print(f"  Failed to read commit metadata ({exc})")
+            commit_index = {}
+
         for commit in selected_commits:
-            try:
-                commit_info = get_commit_info(commit, repo_url)
-                commit_infos.append(commit_info)
-                print(f"  {commit_info['short']}: {commit_info['subject']}")
-            except (subprocess.CalledProcessError, ValueError) as exc:
-                print(f"  {commit[:8]}: Not found or inaccessible ({exc})")
+            entry = commit_index.get(commit)
+            if entry is None:
+                print(f"  {commit[:8]}: Not found or inaccessible")
                 missing_commits.append(commit)
+                continue
+            commit_info = entry["info"]
+            commit_infos.append(commit_info)
+            print(f"  {commit_info['short']}: {commit_info['subject']}")
 
         if not commit_infos:
             print("Error: No valid commits found for the requested selection")
             sys.exit(1)
 
+        commit_shas = [info["sha"] for info in commit_infos]
+        parents = {sha: commit_index[sha]["parent"] for sha in commit_shas}
+        changed_files = {sha: commit_index[sha]["files"] for sha in commit_shas}
+        checks_map = get_checks_bulk(commit_shas, repo_name)
+
         successful_commits: List[Tuple[Dict[str, str], str]] = []
         successful_commits_with_logs: List[Tuple[Dict[str, str], str]] = []
         processed_commits: List[Dict[str, object]] = []
         processed_commits_with_logs: List[Dict[str, object]] = []
 
-        for commit_info in commit_infos:
-            print(f"\n--- Processing commit {commit_info['short']}: {commit_info['subject']} ---")
-
-            files = get_commit_changed_files(commit_info["sha"])
-            if not files:
-                print(f"No changed files found for commit {commit_info['short']}")
-                continue
-
-            print(f"Total changed files: {len(files)}")
-
-            included_files, _excluded_files = filter_excluded_files(files)
-            if not included_files:
-                print(
-                    f"No files to process for commit {commit_info['short']} "
-                    "(all files were excluded)"
-                )
-                continue
-
-            print(
-                f"Files to process ({len(included_files)}): "
-                f"{', '.join(included_files)}"
+        # A commit produces a report exactly when it changes a non-excluded
+        # file, so the master comparison total is known before processing.
+        report_shas = [
+            sha
+            for sha in commit_shas
+            if any(not is_excluded_file(path) for path in changed_files.get(sha, {}))
+        ]
+        report_total = len(report_shas)
+        collect_logs = not args.no_logs
+        logs_by_run = (
+            fetch_failed_run_logs(
+                {sha: checks_map[sha] for sha in report_shas if sha in checks_map},
+                log_spool.name,
+                max_workers=args.jobs,
             )
+            if collect_logs
+            else {}
+        )
 
-            try:
-                checks_with_logs: List[Dict[str, str]] = []
-                checks = get_commit_checks(commit_info["sha"], repo_name)
-            except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as exc:
-                print(f"Failed to retrieve checks for commit {commit_info['short']}: {exc}")
-                checks = []
-                checks_with_logs = []
-            else:
-                for check in checks:
-                    check_copy = dict(check)
-                    logs = get_failed_check_logs(check_copy)
-                    if logs:
-                        check_copy["logOutput"] = logs
-                    checks_with_logs.append(check_copy)
-
-            output_file = os.path.join(
-                args.output_dir, f"commit-{commit_info['short']}-implementation.txt"
-            )
-            output_file_with_logs = os.path.join(
-                args.output_dir, f"commit-{commit_info['short']}-implementation-with-logs.txt"
-            )
-            if run_commit_big_picture(
-                commit_info,
-                included_files,
-                checks,
-                output_file,
-                include_logs=False,
-            ):
-                successful_commits.append((commit_info, output_file))
-                processed_commits.append(
-                    {
-                        "info": commit_info,
-                        "file": output_file,
-                        "files": included_files,
-                    }
+        with ExitStack() as stack:
+            masters: Dict[bool, BinaryIO] = {}
+            if report_total:
+                print("Creating master comparison files...")
+                for include_logs, path in (
+                    (False, outputs["master_output"]),
+                    (True, outputs_with_logs["master_output"]),
+                ):
+                    if include_logs and not collect_logs:
+                        continue
+                    master = stack.enter_context(open_output(path))
+                    log_note = " (with logs)" if include_logs else ""
+                    write_text(
+                        master,
+                        compilation_header(
+                            f"# Master Comparison{log_note}", selection_header, report_total
+                        ),
+                    )
+                    masters[include_logs] = master
+
+            max_workers = min(args.jobs, len(commit_infos))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Reports are written while later commits are still being
+                # prepared; the window caps how many are held at once.
+                prepared_commits = bounded_map(
+                    executor,
+                    partial(
+                        prepare_commit,
+                        repo_name=repo_name,
+                        logs_by_run=logs_by_run,
+                        spool_dir=log_spool.name,
+                        collect_logs=collect_logs,
+                    ),
+                    commit_infos,
+                    [list(changed_files.get(sha, {})) for sha in commit_shas],
+                    [checks_map.get(sha) for sha in commit_shas],
+                    window=PREPARE_WINDOW_PER_WORKER * max_workers,
                 )
-            if run_commit_big_picture(
-                commit_info,
-                included_files,
-                checks_with_logs,
-                output_file_with_logs,
-                include_logs=True,
-            ):
-                successful_commits_with_logs.append((commit_info, output_file_with_logs))
-                processed_commits_with_logs.append(
-                    {
-                        "info": commit_info,
-                        "file": output_file_with_logs,
-                        "files": included_files,
-                    }
+                # Report commits come back in report_shas order, so each
+                # takes the next diff from the shared git log stream.
+                cached_diffs = cache.cached_shas("diff", report_shas) if cache else set()
+                commit_diffs = iter_commit_diffs(
+                    [sha for sha in report_shas if sha not in cached_diffs]
+                )
+                for prepared in prepared_commits:
+                    if prepared is None:
+                        continue
+                    commit_sha = prepared["info"]["sha"]
+                    if commit_sha in cached_diffs:
+                        diff_output = cache.get("diff", commit_sha)
+                    else:
+                        diff_sha, diff_output = next(commit_diffs, (None, ""))
+                        if diff_sha != commit_sha:
+                            diff_output = show_commit_diff(commit_sha)
+                        if cache:
+                            cache.put("diff", commit_sha, diff_output)
+                    prepared["diff"] = diff_output
+                    processed, processed_with_logs = write_commit_reports(
+                        prepared,
+                        args.output_dir,
+                        len(processed_commits) + 1,
+                        report_total,
+                        masters,
+                    )
+                    if processed:
+                        successful_commits.append((processed["info"], processed["file"]))
+                        processed_commits.append(processed)
+                    if processed_with_logs:
+                        successful_commits_with_logs.append(
+                            (processed_with_logs["info"], processed_with_logs["file"])
+                        )
+                        processed_commits_with_logs.append(processed_with_logs)
+
+        if report_total:
+            print(f"✓ Created master comparison: {outputs['master_output']}")
+            if collect_logs:
+                print(
+                    "✓ Created master comparison (with logs): "
+                    f"{outputs_with_logs['master_output']}"
                 )
 
         if successful_commits:
@@ -909,52 +2262,40 @@ def main() -> None:
                 skipped_short = ", ".join(commit[:8] for commit in skipped_commits)
                 print(f"Skipped commits after processing: {skipped_short}")
 
-            master_output = os.path.join(
-                args.output_dir, f"commit-comparison-{selection_tag}.txt"
-            )
-            create_master_comparison(
-                successful_commits,
-                selection_requested,
-                selection_canonical,
-                selected_commits,
-                master_output,
-            )
-
-            summary_output = os.path.join(
-                args.output_dir, f"commit-summaries-{selection_tag}.txt"
-            )
-            create_summary_compilation(
-                successful_commits,
-                selection_requested,
-                selection_canonical,
-                selected_commits,
-                summary_output,
-            )
+        emit_all_outputs(
+            commit_infos,
+            [
+                {
+                    "commit_files": successful_commits,
+                    "include_logs": False,
+                    **outputs,
+                },
+                {
+                    "commit_files": successful_commits_with_logs,
+                    "include_logs": True,
+                    **outputs_with_logs,
+                },
+            ],
+            selection_header,
+            parents,
+            changed_files,
+            cat_file,
+        )
 
-            touched_output = os.path.join(
-                args.output_dir, f"commit-touched-files-{selection_tag}.txt"
-            )
-            create_touched_files_compilation(
-                commit_infos,
-                selection_requested,
-                selection_canonical,
-                selected_commits,
-                touched_output,
-                master_output,
-            )
+        if successful_commits:
             round_robin_outputs = create_round_robin_comparisons(
                 processed_commits,
                 args.output_dir,
-                selection_requested,
+                selection_header,
                 selection_canonical,
-                selected_commits,
+                max_workers=args.jobs,
             )
 
             print(f"\n✓ Successfully processed {len(successful_commits)} commit(s) (without logs)")
             print(f"✓ Individual files: {args.output_dir}/commit-{{sha}}-implementation.txt")
-            print(f"✓ Master comparison: {master_output}")
-            print(f"✓ Summary compilation: {summary_output}")
-            print(f"✓ Touched files compilation: {touched_output}")
+            print(f"✓ Master comparison: {outputs['master_output']}")
+            print(f"✓ Summary compilation: {outputs['summary_output']}")
+            print(f"✓ Touched files compilation: {outputs['touched_output']}")
             if round_robin_outputs:
                 print(
                     "✓ Round-robin comparisons: "
@@ -964,63 +2305,38 @@ def main() -> None:
             print("\nNo commits were successfully processed (without logs)")
 
         if successful_commits_with_logs:
-            master_output_with_logs = os.path.join(
-                args.output_dir, f"commit-comparison-{selection_tag}-with-logs.txt"
-            )
-            create_master_comparison(
-                successful_commits_with_logs,
-                selection_requested,
-                selection_canonical,
-                selected_commits,
-                master_output_with_logs,
-                include_logs=True,
-            )
-
-            summary_output_with_logs = os.path.join(
-                args.output_dir, f"commit-summaries-{selection_tag}-with-logs.txt"
-            )
-            create_summary_compilation(
-                successful_commits_with_logs,
-                selection_requested,
-                selection_canonical,
-                selected_commits,
-                summary_output_with_logs,
-                include_logs=True,
-            )
-
-            touched_output_with_logs = os.path.join(
-                args.output_dir, f"commit-touched-files-{selection_tag}-with-logs.txt"
-            )
-            create_touched_files_compilation(
-                commit_infos,
-                selection_requested,
-                selection_canonical,
-                selected_commits,
-                touched_output_with_logs,
-                master_output_with_logs,
-                include_logs=True,
-            )
-
             print(f"\n✓ Successfully processed {len(successful_commits_with_logs)} commit(s) (with logs)")
             print(
                 f"✓ Individual files (with logs): {args.output_dir}/commit-{{sha}}-implementation-with-logs.txt"
             )
-            print(f"✓ Master comparison (with logs): {master_output_with_logs}")
-            print(f"✓ Summary compilation (with logs): {summary_output_with_logs}")
-            print(f"✓ Touched files compilation (with logs): {touched_output_with_logs}")
-        else:
+            print(f"✓ Master comparison (with logs): {outputs_with_logs['master_output']}")
+            print(f"✓ Summary compilation (with logs): {outputs_with_logs['summary_output']}")
+            print(
+                "✓ Touched files compilation (with logs): "
+                f"{outputs_with_logs['touched_output']}"
+            )
+        elif collect_logs:
             print("\nNo commits were successfully processed (with logs)")
 
     except KeyboardInterrupt:
         print("\nInterrupted by user")
+    except BrokenPipeError:
+        if not stdout_closed():
+            raise
+        discard_stdout()
+        raise SystemExit(1)
     finally:
-        if not args.no_cleanup:
-            try:
-                checkout_base_branch(args.base_branch)
-                print(f"✓ Returned to {args.base_branch} branch")
-            except subprocess.CalledProcessError:
-                print(f"Warning: Failed to return to {args.base_branch} branch")
+        cat_file.close()
+        log_spool.cleanup()
+        if cache:
+            cache.close()
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except BrokenPipeError:
+        if not stdout_closed():
+            raise
+        discard_stdout()
+        sys.exit(1)
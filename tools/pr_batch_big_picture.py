@@ -12,24 +12,52 @@ import hashlib
 import json
 import os
 import re
-import shlex
+import select
+import shutil
 import subprocess
 import sys
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
-from itertools import combinations
+from functools import lru_cache, partial
+from itertools import chain, combinations
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterator, List, Set, TextIO, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ACTIONS_RUN_ID_RE = re.compile(r"/actions/runs/(\d+)")
+
+# Base-branch snapshots, and per-PR files when os.sendfile is unavailable,
+# are copied into the compilations in chunks of this many bytes.
+COPY_CHUNK_SIZE = 1 << 20
+# Generated files are written through a buffer this large, so the many small
+# header/section writes reach the OS in a few large writes.
+OUTPUT_BUFFER_SIZE = 1 << 20
 
 
 class SelectionParseError(ValueError):
     """Raised when a PR selection string cannot be parsed."""
 
 
-def run_command(cmd: str, check: bool = True, capture_output: bool = True) -> str:
-    """Run a shell command and return the result."""
+def parse_json(text: str | bytes) -> object:
+    """Parse JSON, using orjson when it is installed.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+    the same exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def run_command(argv: List[str], check: bool = True, capture_output: bool = True) -> str:
+    """Run a command (argv list, no shell) and return the result."""
     result = subprocess.run(
-        cmd,
-        shell=True,
+        argv,
         check=check,
         capture_output=capture_output,
         text=True,
@@ -37,6 +65,163 @@ def run_command(cmd: str, check: bool = True, capture_output: bool = True) -> st
     return result.stdout.strip() if capture_output else ""
 
 
+# Past this many unread bytes, skip_blob() restarts cat-file rather than
+# reading the rest of a snapshot just to throw it away.
+SKIP_RESTART_BYTES = 4 << 20
+
+
+class CatFileBatch:
+    """Long-running ``git cat-file --batch`` process for reading file snapshots.
+
+    The process is started on first use so a single instance can be shared for
+    a whole compilation and closed unconditionally at the end.
+    """
+
+    def __init__(self) -> None:
+        self.process: subprocess.Popen | None = None
+        # Bytes of the current snapshot not yet read, trailing newline included.
+        self.unread = 0
+
+    def __enter__(self) -> "CatFileBatch":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Terminate the cat-file process if it was started."""
+        if self.process is None:
+            return
+        if self.process.stdin:
+            self.process.stdin.close()
+        if self.unread:
+            # git may be blocked writing a snapshot that will never be read.
+            self.process.kill()
+        self.process.wait()
+        self.process = None
+        self.unread = 0
+
+    def open_blob(self, rev: str, file_path: str) -> int | None:
+        """Request a file snapshot and return its size, or None if it does not exist.
+
+        The snapshot is read with read_chunks(); whatever is left unread is
+        skipped before the next request.
+        """
+        if self.unread:
+            self.skip_blob()
+        request = f"{rev}:{file_path}"
+        if "\n" in file_path:
+            # Requests are newline-delimited, so name this blob by its object ID.
+            request = run_command(["git", "rev-parse", "--verify", "--quiet", request], check=False)
+            if not request:
+                return None
+        if self.process is None:
+            self.process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        stdin = self.process.stdin
+        stdout = self.process.stdout
+        assert stdin is not None and stdout is not None
+
+        try:
+            stdin.write(f"{request}\n".encode("utf-8"))
+            stdin.flush()
+        except BrokenPipeError as exc:
+            raise RuntimeError("git cat-file --batch exited unexpectedly") from exc
+        header = stdout.readline()
+        if not header:
+            raise RuntimeError("git cat-file --batch exited unexpectedly")
+
+        fields = header.split()
+        if fields[-1] in (b"missing", b"ambiguous"):
+            return None
+        size = int(fields[2])
+        self.unread = size + 1
+        return size
+
+    def read_chunks(self, chunk_size: int = COPY_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the rest of the current snapshot in chunks, then consume its trailing newline."""
+        assert self.process is not None and self.process.stdout is not None
+        stdout = self.process.stdout
+        while self.unread > 1:
+            chunk = stdout.read(min(chunk_size, self.unread - 1))
+            if not chunk:
+                raise RuntimeError("git cat-file --batch exited unexpectedly")
+            self.unread -= len(chunk)
+            yield chunk
+        stdout.read(1)
+        self.unread = 0
+
+    def skip_blob(self) -> None:
+        """Drop whatever is left of the current snapshot.
+
+        Short remainders are read and discarded. Longer ones stop the process
+        instead, and the next request starts a fresh one, so git does not
+        inflate and pipe a large blob (usually a binary) that nobody reads.
+        """
+        if self.unread > SKIP_RESTART_BYTES:
+            self.close()
+            return
+        for _chunk in self.read_chunks():
+            pass
+
+
+BINARY_PLACEHOLDER = "# (binary file omitted from report)"
+
+
+def is_probably_binary(sample: bytes) -> bool:
+    """Flag probable binary content from the leading bytes of a file snapshot."""
+    if not sample:
+        return False
+    if b"\0" in sample:
+        return True
+
+    control_bytes = sum(
+        1 for byte in sample if byte < 9 or (13 < byte < 32)
+    )
+    return control_bytes / len(sample) > 0.1
+
+
+@contextmanager
+def open_output(path: str) -> Iterator[TextIO]:
+    """Open an output file for buffered text writing, replacing path on success.
+
+    Data goes to ``<path>.tmp`` first, so an interrupted run leaves the
+    previous file (or none) instead of a truncated one.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as outf:
+            yield outf
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def append_file(outf: TextIO, path: str) -> None:
+    """Append the raw bytes of path to outf, copying inside the kernel when possible."""
+    outf.flush()
+    with open(path, "rb") as inf:
+        remaining = os.fstat(inf.fileno()).st_size
+        offset = 0
+        try:
+            while remaining > 0:
+                sent = os.sendfile(outf.fileno(), inf.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        except (AttributeError, OSError):
+            # os.sendfile is missing or refuses regular files on some
+            # platforms; fall back to a user-space copy from where it stopped.
+            inf.seek(offset)
+            shutil.copyfileobj(inf, outf.buffer, COPY_CHUNK_SIZE)
+
+
 def parse_pr_selection(selection: str) -> List[int]:
     """Parse a selection string into a sorted list of unique PR numbers."""
     original = selection
@@ -56,7 +241,7 @@ def parse_pr_selection(selection: str) -> List[int]:
 
     selected: Set[int] = set()
     for segment in segments:
-        cleaned = re.sub(r"\s+", "", segment)
+        cleaned = "".join(segment.split())
         if not cleaned:
             raise SelectionParseError(
                 f"Invalid PR selection segment '{segment}' in '{original}'. "
@@ -75,8 +260,7 @@ def parse_pr_selection(selection: str) -> List[int]:
                     f"Invalid PR range '{segment}' in '{original}': start must be <= end. "
                     "Expected format like '123-130,135,140-142'."
                 )
-            for number in range(start, end + 1):
-                selected.add(number)
+            selected.update(range(start, end + 1))
         else:
             raise SelectionParseError(
                 f"Invalid PR selection segment '{segment}' in '{original}'. "
@@ -156,6 +340,12 @@ def format_pr_list_preview(prs: List[int], max_items: int = 20, edge_items: int
     return f"{head} ... {tail}"
 
 
+@lru_cache(maxsize=None)
+def generated_timestamp() -> str:
+    """Return the "Generated" timestamp, fixed at first use so every output of a run agrees."""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
 def selection_header_lines(
     selection_requested: str, selection_canonical: str, selected_prs: List[int]
 ) -> List[str]:
@@ -180,7 +370,7 @@ def selection_header_lines(
 
 def check_current_branch(expected_branch: str) -> None:
     """Ensure we're starting from the expected base branch."""
-    current_branch = run_command("git branch --show-current")
+    current_branch = run_command(["git", "branch", "--show-current"])
     if current_branch != expected_branch:
         print(
             f"Error: Currently on branch '{current_branch}'. "
@@ -193,26 +383,42 @@ def check_current_branch(expected_branch: str) -> None:
 def checkout_base_branch(base_branch: str) -> None:
     """Checkout the base branch."""
     print(f"Checking out {base_branch} branch...")
-    run_command(f"git checkout {shlex.quote(base_branch)}")
+    run_command(["git", "checkout", base_branch], capture_output=False)
     print(f"✓ Checked out {base_branch} branch")
 
 
 def fetch_remote_branches(remote: str) -> None:
     """Fetch latest remote branches."""
     print(f"Fetching remote branches from {remote}...")
-    run_command(f"git fetch {shlex.quote(remote)} --prune --tags")
+    run_command(["git", "fetch", remote, "--prune", "--tags"], capture_output=False)
     print("✓ Fetched remote branches")
 
 
-def get_pr_info(pr_number: int) -> Dict[str, str]:
-    """Get branch name, title, and metadata for a specific PR."""
-    pr_info = run_command(
-        "gh pr view "
-        f"{pr_number} "
-        "--json headRefName,title,baseRefName,body,author,createdAt,url"
+def get_pr_view(
+    pr_number: int,
+) -> Tuple[Dict[str, str], List[str], List[Dict[str, str]]]:
+    """Get the metadata, changed files, and status checks for a PR.
+
+    One gh pr view call returns all three; comments keep their own call
+    (see get_pr_comments) so a failure there cannot hide the PR itself.
+    """
+    view_json = run_command(
+        [
+            "gh",
+            "pr",
+            "view",
+            str(pr_number),
+            "--json",
+            "headRefName,title,baseRefName,body,author,createdAt,url,"
+            "files,statusCheckRollup",
+        ]
     )
-    data = json.loads(pr_info)
+    data = parse_json(view_json)
+    return parse_pr_info(pr_number, data), parse_pr_files(data), parse_pr_checks(data)
+
 
+def parse_pr_info(pr_number: int, data: Dict[str, object]) -> Dict[str, str]:
+    """Extract branch name, title, and metadata from gh pr view JSON."""
     return {
         "number": pr_number,
         "branch": data["headRefName"],
@@ -225,10 +431,8 @@ def get_pr_info(pr_number: int) -> Dict[str, str]:
     }
 
 
-def get_pr_changed_files(pr_number: int) -> List[str]:
-    """Get list of changed files for a specific PR."""
-    files_json = run_command(f"gh pr view {pr_number} --json files")
-    data = json.loads(files_json)
+def parse_pr_files(data: Dict[str, object]) -> List[str]:
+    """Extract the changed file paths from gh pr view JSON."""
     return [file_info["path"] for file_info in data.get("files", [])]
 
 
@@ -247,9 +451,9 @@ def normalize_comment_entry(comment: Dict[str, str], comment_type: str) -> Dict[
 def get_pr_comments(pr_number: int) -> List[Dict[str, str]]:
     """Get all comments (issue + review threads) for a specific PR."""
     comments_json = run_command(
-        f"gh pr view {pr_number} --json comments,reviewThreads"
+        ["gh", "pr", "view", str(pr_number), "--json", "comments,reviewThreads"]
     )
-    data = json.loads(comments_json)
+    data = parse_json(comments_json)
 
     normalized: List[Dict[str, str]] = []
     for comment in data.get("comments", []):
@@ -263,13 +467,8 @@ def get_pr_comments(pr_number: int) -> List[Dict[str, str]]:
     return normalized
 
 
-def get_pr_checks(pr_number: int) -> List[Dict[str, str]]:
-    """Get status check results for a specific PR."""
-    checks_json = run_command(
-        f"gh pr view {pr_number} --json statusCheckRollup"
-    )
-    data = json.loads(checks_json)
-
+def parse_pr_checks(data: Dict[str, object]) -> List[Dict[str, str]]:
+    """Extract status check results from gh pr view JSON."""
     checks: List[Dict[str, str]] = []
     for check in data.get("statusCheckRollup") or []:
         checks.append(
@@ -299,31 +498,52 @@ def extract_actions_run_id(details_url: str | None) -> str | None:
     """Extract the GitHub Actions run ID from a details URL."""
     if not details_url:
         return None
-    match = re.search(r"/actions/runs/(\d+)", details_url)
+    match = ACTIONS_RUN_ID_RE.search(details_url)
     return match.group(1) if match else None
 
 
-def get_failed_check_logs(check: Dict[str, str]) -> str | None:
-    """Retrieve raw logs for failed GitHub Actions checks."""
+# Check conclusions that count as passing.
+PASSING_CONCLUSIONS = frozenset({"success", "neutral", "skipped"})
+
+
+def failed_check_run_id(check: Dict[str, str]) -> str | None:
+    """Return the Actions run ID behind a failed check, or None."""
     conclusion = (check.get("conclusion") or "").lower()
-    if conclusion in {"success", "neutral", "skipped"}:
+    if conclusion in PASSING_CONCLUSIONS:
         return None
+    return extract_actions_run_id(check.get("detailsUrl") or "")
 
-    run_id = extract_actions_run_id(check.get("detailsUrl") or "")
-    if not run_id:
-        return None
 
+def fetch_run_logs(run_id: str) -> str | None:
+    """Retrieve the raw logs for a GitHub Actions run, or None on failure."""
     try:
-        print(
-            f"Fetching logs for failed check '{check.get('name', 'unknown check')}' "
-            f"(run {run_id})"
-        )
-        return run_command(f"gh run view {shlex.quote(run_id)} --log")
+        return run_command(["gh", "run", "view", run_id, "--log"])
     except subprocess.CalledProcessError as exc:
         print(f"Warning: Failed to fetch logs for run {run_id}: {exc}")
         return None
 
 
+def submit_failed_run_logs(
+    executor: Executor, checks_by_pr: Dict[int, List[Dict[str, str]]]
+) -> Dict[str, Future]:
+    """Start fetching logs for every failed Actions run once, keyed by run ID.
+
+    Several checks (and PRs) often point at the same run, so each run is
+    downloaded a single time, on the executor, while PRs are processed.
+    """
+    log_futures: Dict[str, Future] = {}
+    for checks in checks_by_pr.values():
+        for check in checks:
+            run_id = failed_check_run_id(check)
+            if run_id and run_id not in log_futures:
+                print(
+                    f"Fetching logs for failed check "
+                    f"'{check.get('name', 'unknown check')}' (run {run_id})"
+                )
+                log_futures[run_id] = executor.submit(fetch_run_logs, run_id)
+    return log_futures
+
+
 def filter_existing_files(files: List[str]) -> Tuple[List[str], List[str]]:
     """Filter list of files to only those that exist on current branch."""
     existing_files: List[str] = []
@@ -341,13 +561,21 @@ def filter_existing_files(files: List[str]) -> Tuple[List[str], List[str]]:
     return existing_files, deleted_files
 
 
+EXCLUDED_BASENAMES = frozenset({"package-lock.json"})
+
+
+def is_excluded_file(file_path: str) -> bool:
+    """Return True for files that should be left out of documents."""
+    return file_path.rpartition("/")[2] in EXCLUDED_BASENAMES
+
+
 def filter_excluded_files(files: List[str]) -> Tuple[List[str], List[str]]:
     """Filter files that should be excluded from documents."""
     excluded_files: List[str] = []
     included_files: List[str] = []
 
     for file_path in files:
-        if Path(file_path).name == "package-lock.json":
+        if is_excluded_file(file_path):
             excluded_files.append(file_path)
         else:
             included_files.append(file_path)
@@ -364,17 +592,14 @@ def checkout_pr_branch(pr_info: Dict[str, str], remote: str) -> str:
     print(f"Attempting to checkout branch {branch_name}...")
 
     try:
-        run_command(f"git checkout {shlex.quote(branch_name)}")
+        run_command(["git", "checkout", branch_name])
         print(f"✓ Checked out existing branch: {branch_name}")
         return branch_name
     except subprocess.CalledProcessError:
         pass
 
     try:
-        run_command(
-            f"git checkout -b {shlex.quote(branch_name)} "
-            f"{shlex.quote(remote)}/{shlex.quote(branch_name)}"
-        )
+        run_command(["git", "checkout", "-b", branch_name, f"{remote}/{branch_name}"])
         print(f"✓ Created and checked out branch: {branch_name}")
         return branch_name
     except subprocess.CalledProcessError:
@@ -383,9 +608,10 @@ def checkout_pr_branch(pr_info: Dict[str, str], remote: str) -> str:
     fallback_branch = f"pr-{pr_info['number']}"
     try:
         run_command(
-            f"git fetch {shlex.quote(remote)} pull/{pr_info['number']}/head:{shlex.quote(fallback_branch)}"
+            ["git", "fetch", remote, f"pull/{pr_info['number']}/head:{fallback_branch}"],
+            capture_output=False,
         )
-        run_command(f"git checkout {shlex.quote(fallback_branch)}")
+        run_command(["git", "checkout", fallback_branch], capture_output=False)
         print(f"✓ Checked out PR ref as {fallback_branch}")
         return fallback_branch
     except subprocess.CalledProcessError as exc:
@@ -431,101 +657,131 @@ def generate_file_descriptions(files: List[str]) -> List[str]:
     return file_args
 
 
+class TeeWriter:
+    """Fan a single stream of text writes out to several output files."""
+
+    def __init__(self, outputs: List[TextIO]) -> None:
+        self.outputs = outputs
+
+    def write(self, data: str) -> int:
+        for output in self.outputs:
+            output.write(data)
+        return len(data)
+
+
+def format_checks_section(checks: List[Dict[str, str]], include_logs: bool) -> str:
+    """Render the checks block of a per-PR diff file."""
+    parts = ["=" * 80 + "\n", f"Checks ({len(checks)}):\n"]
+    if not checks:
+        parts.append("# No checks found\n")
+    else:
+        for check in checks:
+            name = check.get("name") or "unknown check"
+            status = check.get("status") or "unknown"
+            conclusion = check.get("conclusion") or "unknown"
+            details_url = check.get("detailsUrl") or ""
+            log_output = check.get("logOutput") or ""
+            heading = f"- {name}: status={status}, conclusion={conclusion}"
+            if details_url:
+                heading += f" [{details_url}]"
+            parts.append(heading + "\n")
+
+            summary_text = check.get("summary") or check.get("title") or ""
+            if summary_text:
+                parts.extend(f"    {line}\n" for line in summary_text.splitlines())
+            if include_logs and log_output:
+                parts.append("    Logs:\n")
+                parts.extend(f"    {line}\n" for line in log_output.splitlines())
+    parts.append("\n")
+    return "".join(parts)
+
+
+def format_comments_section(comments: List[Dict[str, str]]) -> str:
+    """Render the comments block that ends a per-PR diff file."""
+    parts = ["=" * 80 + "\n", f"Comments ({len(comments)}):\n"]
+    if not comments:
+        parts.append("# No comments found\n")
+    else:
+        for comment in comments:
+            timestamp = comment.get("createdAt") or "unknown time"
+            author = comment.get("author") or "unknown author"
+            comment_type = comment.get("type") or "comment"
+            url = comment.get("url") or ""
+            heading = f"- [{timestamp}] {author} ({comment_type})"
+            if url:
+                heading += f" [{url}]"
+            parts.append(heading + "\n")
+            body = comment.get("body") or ""
+            lines = body.splitlines() or ["(no content)"]
+            parts.extend(f"    {line}\n" for line in lines)
+            parts.append("\n")
+    return "".join(parts)
+
+
 def run_big_picture(
     pr_info: Dict[str, str],
     files: List[str],
     comments: List[Dict[str, str]],
     checks: List[Dict[str, str]],
+    checks_with_logs: List[Dict[str, str]],
     output_file: str,
-    include_logs: bool = False,
+    output_file_with_logs: str,
     base_branch: str = "main",
     local_branch: str | None = None,
 ) -> bool:
-    """Generate a git diff for the PR instead of full files."""
+    """Generate the without-logs and with-logs diff compilations for a PR.
+
+    The diff is computed once and everything except the checks section is
+    written to both files through a tee.
+    """
     branch_for_diff = local_branch or pr_info["branch"]
-    print(f"Creating diff compilation for PR #{pr_info['number']}...")
+    print(f"Creating diff compilations for PR #{pr_info['number']}...")
 
     if not files:
         print(f"Warning: No files found for PR #{pr_info['number']}")
         return False
 
-    files_arg = " ".join(shlex.quote(f) for f in files)
-    cmd = f"git diff {shlex.quote(base_branch)}...{shlex.quote(branch_for_diff)} -- {files_arg}"
-
-    diff_output = run_command(cmd)
+    diff_output = run_command(
+        ["git", "diff", f"{base_branch}...{branch_for_diff}", "--", *files]
+    )
 
     summary_text = " ".join(pr_info.get("body", "").split()) or "(no summary provided)"
 
-    with open(output_file, "w", encoding="utf-8") as diff_file:
-        diff_file.write(f"# PR #{pr_info['number']}: {pr_info['title']}\n")
-        diff_file.write(f"# Branch: {branch_for_diff}\n")
-        diff_file.write(f"# Base: {base_branch}\n")
-        diff_file.write(f"# Author: {pr_info.get('author', 'unknown')}\n")
-        diff_file.write(f"# Created: {pr_info.get('createdAt', '')}\n")
-        diff_file.write(f"# URL: {pr_info.get('url', '')}\n")
-        diff_file.write(f"# Summary: {summary_text}\n")
-        diff_file.write(f"# Changed files: {len(files)}\n")
-        diff_file.write(f"# Files: {', '.join(files)}\n\n")
-        diff_file.write("=" * 80 + "\n")
-        diff_file.write(diff_output if diff_output else "# No differences found\n")
-        diff_file.write("\n\n")
-        diff_file.write("=" * 80 + "\n")
-        diff_file.write(f"Checks ({len(checks)}):\n")
-
-        if not checks:
-            diff_file.write("# No checks found\n")
-        else:
-            for check in checks:
-                name = check.get("name") or "unknown check"
-                status = check.get("status") or "unknown"
-                conclusion = check.get("conclusion") or "unknown"
-                details_url = check.get("detailsUrl") or ""
-                log_output = check.get("logOutput") or ""
-                heading = f"- {name}: status={status}, conclusion={conclusion}"
-                if details_url:
-                    heading += f" [{details_url}]"
-                diff_file.write(heading + "\n")
-
-                summary_text = check.get("summary") or check.get("title") or ""
-                if summary_text:
-                    for line in summary_text.splitlines():
-                        diff_file.write(f"    {line}\n")
-                if include_logs and log_output:
-                    diff_file.write("    Logs:\n")
-                    for line in log_output.splitlines():
-                        diff_file.write(f"    {line}\n")
-
-        diff_file.write("\n")
-        diff_file.write("=" * 80 + "\n")
-        diff_file.write(f"Comments ({len(comments)}):\n")
-
-        if not comments:
-            diff_file.write("# No comments found\n")
-        else:
-            for comment in comments:
-                timestamp = comment.get("createdAt") or "unknown time"
-                author = comment.get("author") or "unknown author"
-                comment_type = comment.get("type") or "comment"
-                url = comment.get("url") or ""
-                heading = f"- [{timestamp}] {author} ({comment_type})"
-                if url:
-                    heading += f" [{url}]"
-                diff_file.write(heading + "\n")
-                body = comment.get("body") or ""
-                lines = body.splitlines() or ["(no content)"]
-                for line in lines:
-                    diff_file.write(f"    {line}\n")
-                diff_file.write("\n")
+    header = "".join(
+        [
+            f"# PR #{pr_info['number']}: {pr_info['title']}\n",
+            f"# Branch: {branch_for_diff}\n",
+            f"# Base: {base_branch}\n",
+            f"# Author: {pr_info.get('author', 'unknown')}\n",
+            f"# Created: {pr_info.get('createdAt', '')}\n",
+            f"# URL: {pr_info.get('url', '')}\n",
+            f"# Summary: {summary_text}\n",
+            f"# Changed files: {len(files)}\n",
+            f"# Files: {', '.join(files)}\n\n",
+            "=" * 80 + "\n",
+        ]
+    )
+
+    with (
+        open_output(output_file) as diff_file,
+        open_output(output_file_with_logs) as diff_file_with_logs,
+    ):
+        shared = TeeWriter([diff_file, diff_file_with_logs])
+        shared.write(header)
+        shared.write(diff_output if diff_output else "# No differences found\n")
+        shared.write("\n\n")
+        diff_file.write(format_checks_section(checks, include_logs=False))
+        diff_file_with_logs.write(format_checks_section(checks_with_logs, include_logs=True))
+        shared.write(format_comments_section(comments))
 
     print(f"✓ Created diff: {output_file}")
+    print(f"✓ Created diff: {output_file_with_logs}")
     return True
 
 
 def create_master_comparison(
     pr_files: List[Tuple[Dict[str, str], str]],
-    selection_requested: str,
-    selection_canonical: str,
-    selected_prs: List[int],
+    selection_header: str,
     output_file: str,
     include_logs: bool = False,
 ) -> bool:
@@ -536,24 +792,22 @@ def create_master_comparison(
         print("Warning: No individual PR files found for master comparison")
         return False
 
-    with open(output_file, "w", encoding="utf-8") as outf:
+    with open_output(output_file) as outf:
         log_note = " (with logs)" if include_logs else ""
         outf.write(f"# Master Comparison{log_note}\n")
-        for line in selection_header_lines(
-            selection_requested, selection_canonical, selected_prs
-        ):
-            outf.write(f"{line}\n")
+        outf.write(selection_header)
         outf.write(f"# Total PRs: {len(pr_files)}\n")
-        outf.write(f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        outf.write(f"# Generated: {generated_timestamp()}\n")
         outf.write("=" * 80 + "\n\n")
 
         for idx, (pr_info, pr_file) in enumerate(pr_files, 1):
-            outf.write("\n" + "=" * 80 + "\n")
-            outf.write(f"# PR {idx}/{len(pr_files)} - #{pr_info['number']}: {pr_info['title']}\n")
-            outf.write("=" * 80 + "\n\n")
+            outf.write(
+                "\n" + "=" * 80 + "\n"
+                f"# PR {idx}/{len(pr_files)} - #{pr_info['number']}: {pr_info['title']}\n"
+                + "=" * 80 + "\n\n"
+            )
 
-            with open(pr_file, "r", encoding="utf-8") as inf:
-                outf.write(inf.read())
+            append_file(outf, pr_file)
 
             outf.write("\n\n")
 
@@ -564,14 +818,16 @@ def create_master_comparison(
 def create_touched_files_compilation(
     touched_files: Set[str],
     base_branch: str,
-    selection_requested: str,
-    selection_canonical: str,
-    selected_prs: List[int],
-    output_file: str,
-    master_comparison_file: str | None = None,
-    include_logs: bool = False,
+    selection_header: str,
+    outputs: List[Tuple[str, str | None, bool]],
 ) -> bool:
-    """Create a compilation of unique touched files from the base branch."""
+    """Create compilations of unique touched files from the base branch.
+
+    outputs holds ``(output_file, master_comparison_file, include_logs)`` per
+    variant. The file snapshots are identical across variants, so each blob
+    is read once and written to every output; each output then gets its own
+    master comparison appended.
+    """
     print("Creating touched files compilation...")
 
     if not touched_files:
@@ -579,54 +835,70 @@ def create_touched_files_compilation(
         return False
 
     sorted_files = sorted(touched_files)
+    shared_header = "".join(
+        [
+            selection_header,
+            f"# Total unique files: {len(sorted_files)}\n",
+            f"# Source branch: {base_branch}\n",
+            f"# Generated: {generated_timestamp()}\n",
+            "=" * 80 + "\n\n",
+        ]
+    )
 
-    with open(output_file, "w", encoding="utf-8") as outf:
-        log_note = " (with logs)" if include_logs else ""
-        outf.write(f"# Touched Files{log_note} (base branch)\n")
-        for line in selection_header_lines(
-            selection_requested, selection_canonical, selected_prs
-        ):
-            outf.write(f"{line}\n")
-        outf.write(f"# Total unique files: {len(sorted_files)}\n")
-        outf.write(f"# Source branch: {base_branch}\n")
-        outf.write(f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        outf.write("=" * 80 + "\n\n")
+    with ExitStack() as stack:
+        cat_file = stack.enter_context(CatFileBatch())
+        outfs: List[TextIO] = []
+        for output_file, _master_file, include_logs in outputs:
+            outf = stack.enter_context(open_output(output_file))
+            log_note = " (with logs)" if include_logs else ""
+            outf.write(f"# Touched Files{log_note} (base branch)\n" + shared_header)
+            outfs.append(outf)
+        tee = TeeWriter(outfs)
 
         for file_path in sorted_files:
-            ref_path = f"{base_branch}:{file_path}"
-            try:
-                file_contents = run_command(f"git show {shlex.quote(ref_path)}")
-            except subprocess.CalledProcessError:
+            size = cat_file.open_blob(base_branch, file_path)
+            if size is None:
                 print(
                     f"Skipping {file_path} because it does not exist on {base_branch}"
                 )
                 continue
 
-            outf.write("=" * 80 + "\n")
-            outf.write(f"# File: {file_path}\n")
-            outf.write(f"# Source: {base_branch}\n\n")
-            outf.write(file_contents)
-            if not file_contents.endswith("\n"):
-                outf.write("\n")
-            outf.write("\n\n")
+            tee.write("=" * 80 + f"\n# File: {file_path}\n# Source: {base_branch}\n\n")
+            chunks = cat_file.read_chunks()
+            first_chunk = next(chunks, b"")
+            if is_probably_binary(first_chunk):
+                cat_file.skip_blob()
+                print(f"Skipping binary file contents for {file_path} on {base_branch}")
+                tee.write(f"{BINARY_PLACEHOLDER}\n\n\n")
+                continue
 
-        if master_comparison_file and os.path.exists(master_comparison_file):
-            outf.write("=" * 80 + "\n")
-            outf.write(
-                "# Appended master comparison (diffs and summaries)\n\n"
-            )
-            with open(master_comparison_file, "r", encoding="utf-8") as master_file:
-                outf.write(master_file.read())
+            for outf in outfs:
+                outf.flush()
+            last_chunk = first_chunk
+            for chunk in chain((first_chunk,), chunks):
+                for outf in outfs:
+                    outf.buffer.write(chunk)
+                last_chunk = chunk
+            if not last_chunk.endswith(b"\n"):
+                tee.write("\n")
+            tee.write("\n\n")
+
+        for outf, (_output_file, master_file, _include_logs) in zip(outfs, outputs):
+            if master_file and os.path.exists(master_file):
+                outf.write("=" * 80 + "\n")
+                outf.write(
+                    "# Appended master comparison (diffs and summaries)\n\n"
+                )
+                append_file(outf, master_file)
 
-    print(f"✓ Created touched files compilation: {output_file}")
+    for output_file, _master_file, _include_logs in outputs:
+        print(f"✓ Created touched files compilation: {output_file}")
     return True
 
 
 def create_summary_compilation(
     pr_files: List[Tuple[Dict[str, str], str]],
-    selection_requested: str,
-    selection_canonical: str,
-    selected_prs: List[int],
+    selection_header: str,
     output_file: str,
     include_logs: bool = False,
 ) -> bool:
@@ -637,110 +909,129 @@ def create_summary_compilation(
         print("Warning: No PRs available to summarize")
         return False
 
-    with open(output_file, "w", encoding="utf-8") as outf:
+    with open_output(output_file) as outf:
         log_note = " (with logs)" if include_logs else ""
         outf.write(f"# PR Summary Compilation{log_note}\n")
-        for line in selection_header_lines(
-            selection_requested, selection_canonical, selected_prs
-        ):
-            outf.write(f"{line}\n")
+        outf.write(selection_header)
         outf.write(f"# Total PRs: {len(pr_files)}\n")
-        outf.write(f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        outf.write(f"# Generated: {generated_timestamp()}\n")
         outf.write("=" * 80 + "\n\n")
 
         for idx, (pr_info, pr_file) in enumerate(pr_files, 1):
             summary_text = " ".join(pr_info.get("body", "").split()) or "(no summary provided)"
 
-            outf.write(f"## PR {idx}/{len(pr_files)} - #{pr_info['number']}: {pr_info['title']}\n")
-            outf.write(f"- Author: {pr_info.get('author', 'unknown')}\n")
-            outf.write(f"- Created: {pr_info.get('createdAt', '')}\n")
-            outf.write(f"- URL: {pr_info.get('url', '')}\n")
-            outf.write(f"- Summary: {summary_text}\n")
-            outf.write(f"- Detailed file: {pr_file}\n")
-            outf.write("\n")
+            outf.write(
+                f"## PR {idx}/{len(pr_files)} - #{pr_info['number']}: {pr_info['title']}\n"
+                f"- Author: {pr_info.get('author', 'unknown')}\n"
+                f"- Created: {pr_info.get('createdAt', '')}\n"
+                f"- URL: {pr_info.get('url', '')}\n"
+                f"- Summary: {summary_text}\n"
+                f"- Detailed file: {pr_file}\n"
+                "\n"
+            )
 
     print(f"✓ Created summary compilation: {output_file}")
     return True
 
 
-def create_round_robin_comparisons(
-    processed_prs: List[Dict[str, object]],
+def write_round_robin_pair(
+    left: Dict[str, object],
+    right: Dict[str, object],
     output_dir: str,
-    selection_requested: str,
-    selection_canonical: str,
-    selected_prs: List[int],
-) -> List[str]:
-    """Create pairwise comparison files for every PR combination."""
-    print("Creating round-robin comparisons...")
+    selection_header: str,
+) -> str | None:
+    """Write the comparison file for one pair of PRs; return its path.
+
+    Returns None when either entry is malformed. Safe to run from worker
+    threads: it only runs git diff and writes its own output file.
+    """
+    left_info = left["info"]
+    right_info = right["info"]
+    left_branch = left["local_branch"]
+    right_branch = right["local_branch"]
+    left_files = left["files"]
+    right_files = right["files"]
+
+    if not isinstance(left_info, dict) or not isinstance(right_info, dict):
+        return None
+    if not isinstance(left_branch, str) or not isinstance(right_branch, str):
+        return None
+    if not isinstance(left_files, list) or not isinstance(right_files, list):
+        return None
 
-    if len(processed_prs) < 2:
-        print("Warning: Not enough PRs for round-robin comparisons")
-        return []
+    left_number = left_info.get("number")
+    right_number = right_info.get("number")
+    if left_number is None or right_number is None:
+        return None
 
-    output_files: List[str] = []
+    output_file = os.path.join(
+        output_dir, f"pr-{left_number}-versus-{right_number}.txt"
+    )
 
-    for left, right in combinations(processed_prs, 2):
-        left_info = left["info"]
-        right_info = right["info"]
-        left_branch = left["local_branch"]
-        right_branch = right["local_branch"]
-        left_files = left["files"]
-        right_files = right["files"]
+    combined_files = sorted(set(left_files) | set(right_files))
+    diff_cmd = ["git", "diff", left_branch, right_branch]
+    if combined_files:
+        diff_cmd += ["--", *combined_files]
 
-        if not isinstance(left_info, dict) or not isinstance(right_info, dict):
-            continue
-        if not isinstance(left_branch, str) or not isinstance(right_branch, str):
-            continue
-        if not isinstance(left_files, list) or not isinstance(right_files, list):
-            continue
+    diff_output = run_command(diff_cmd)
 
-        left_number = left_info.get("number")
-        right_number = right_info.get("number")
-        if left_number is None or right_number is None:
-            continue
+    left_summary = " ".join(left_info.get("body", "").split()) or "(no summary provided)"
+    right_summary = " ".join(right_info.get("body", "").split()) or "(no summary provided)"
 
-        output_file = os.path.join(
-            output_dir, f"pr-{left_number}-versus-{right_number}.txt"
+    with open_output(output_file) as outf:
+        outf.write(
+            f"# PR #{left_number} vs PR #{right_number}: "
+            f"{left_info.get('title', '')} ↔ {right_info.get('title', '')}\n"
         )
+        outf.write(selection_header)
+        outf.write(f"# Generated: {generated_timestamp()}\n")
+        outf.write(f"# Left branch: {left_branch}\n")
+        outf.write(f"# Right branch: {right_branch}\n")
+        outf.write(f"# Left author: {left_info.get('author', 'unknown')}\n")
+        outf.write(f"# Right author: {right_info.get('author', 'unknown')}\n")
+        outf.write(f"# Left URL: {left_info.get('url', '')}\n")
+        outf.write(f"# Right URL: {right_info.get('url', '')}\n")
+        outf.write(f"# Left summary: {left_summary}\n")
+        outf.write(f"# Right summary: {right_summary}\n")
+        outf.write(f"# Files compared: {len(combined_files)}\n")
+        outf.write(f"# Files: {', '.join(combined_files)}\n\n")
+        outf.write("=" * 80 + "\n")
+        outf.write(diff_output if diff_output else "# No differences found\n")
+        outf.write("\n\n")
+
+    return output_file
 
-        combined_files = sorted(set(left_files) | set(right_files))
-        files_arg = " ".join(shlex.quote(f) for f in combined_files)
-        diff_cmd = (
-            f"git diff {shlex.quote(left_branch)} {shlex.quote(right_branch)}"
-        )
-        if files_arg:
-            diff_cmd += f" -- {files_arg}"
 
-        diff_output = run_command(diff_cmd)
+def create_round_robin_comparisons(
+    processed_prs: List[Dict[str, object]],
+    output_dir: str,
+    selection_header: str,
+    selection_canonical: str,
+    max_workers: int = 8,
+) -> List[str]:
+    """Create pairwise comparison files for every PR combination.
 
-        left_summary = " ".join(left_info.get("body", "").split()) or "(no summary provided)"
-        right_summary = " ".join(right_info.get("body", "").split()) or "(no summary provided)"
+    Pairs are independent, so their git diffs run on a thread pool; the
+    returned paths keep the combinations() order.
+    """
+    print("Creating round-robin comparisons...")
 
-        with open(output_file, "w", encoding="utf-8") as outf:
-            outf.write(
-                f"# PR #{left_number} vs PR #{right_number}: "
-                f"{left_info.get('title', '')} ↔ {right_info.get('title', '')}\n"
-            )
-            for line in selection_header_lines(
-                selection_requested, selection_canonical, selected_prs
-            ):
-                outf.write(f"{line}\n")
-            outf.write(f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            outf.write(f"# Left branch: {left_branch}\n")
-            outf.write(f"# Right branch: {right_branch}\n")
-            outf.write(f"# Left author: {left_info.get('author', 'unknown')}\n")
-            outf.write(f"# Right author: {right_info.get('author', 'unknown')}\n")
-            outf.write(f"# Left URL: {left_info.get('url', '')}\n")
-            outf.write(f"# Right URL: {right_info.get('url', '')}\n")
-            outf.write(f"# Left summary: {left_summary}\n")
-            outf.write(f"# Right summary: {right_summary}\n")
-            outf.write(f"# Files compared: {len(combined_files)}\n")
-            outf.write(f"# Files: {', '.join(combined_files)}\n\n")
-            outf.write("=" * 80 + "\n")
-            outf.write(diff_output if diff_output else "# No differences found\n")
-            outf.write("\n\n")
+    if len(processed_prs) < 2:
+        print("Warning: Not enough PRs for round-robin comparisons")
+        return []
 
-        output_files.append(output_file)
+    pairs = list(combinations(processed_prs, 2))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+        written = executor.map(
+            partial(
+                write_round_robin_pair,
+                output_dir=output_dir,
+                selection_header=selection_header,
+            ),
+            [left for left, _right in pairs],
+            [right for _left, right in pairs],
+        )
+        output_files = [output_file for output_file in written if output_file]
 
     print(
         f"✓ Created {len(output_files)} round-robin comparison file(s) "
@@ -749,6 +1040,31 @@ def create_round_robin_comparisons(
     return output_files
 
 
+def stdout_closed() -> bool:
+    """Return True if stdout is a pipe whose reader has gone away.
+
+    BrokenPipeError can also come from a child process's pipe; only a broken
+    stdout should be treated as the reader closing early. Without poll()
+    (Windows) stdout is assumed to be the broken stream.
+    """
+    if not hasattr(select, "poll"):
+        return True
+    poller = select.poll()
+    poller.register(sys.stdout.fileno(), select.POLLOUT)
+    return any(events & select.POLLERR for _fd, events in poller.poll(0))
+
+
+def discard_stdout() -> None:
+    """Point stdout at /dev/null after its reader went away (e.g. piped into head).
+
+    Later prints, and the final flush at exit, then succeed instead of
+    raising BrokenPipeError again, so cleanup can still run.
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Automate diff generation for selected pull requests",
@@ -790,11 +1106,22 @@ def main() -> None:
         action="store_true",
         help="Don't return to the base branch at the end",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=16,
+        help=(
+            "Maximum concurrent gh workers for per-PR fetches and git workers "
+            "for round-robin diffs (default: 16)"
+        ),
+    )
 
     args = parser.parse_args()
 
     if not args.pr_selection:
         parser.error("pr_selection is required (e.g. '123-130,135,140-142').")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
 
     try:
         selected_prs = parse_pr_selection(args.pr_selection)
@@ -804,6 +1131,13 @@ def main() -> None:
     selection_requested = args.pr_selection
     selection_canonical = format_pr_selection(selected_prs)
     selection_tag = build_selection_tag(selected_prs, selection_canonical)
+    # Rendered once and shared by every compilation and round-robin header.
+    selection_header = "".join(
+        f"{line}\n"
+        for line in selection_header_lines(
+            selection_requested, selection_canonical, selected_prs
+        )
+    )
 
     print(f"Requested PR selection: {selection_requested}")
     print(f"Canonical PR selection: {selection_canonical}")
@@ -816,6 +1150,12 @@ def main() -> None:
 
     check_current_branch(args.base_branch)
 
+    # Set once a PR branch checkout is attempted; until then the working
+    # tree is still on the base branch and needs no cleanup checkout.
+    left_base_branch = False
+    # PR views, comments, and failed-run logs are fetched on this pool;
+    # checkouts and writes stay sequential on the main thread.
+    executor = ThreadPoolExecutor(max_workers=args.jobs)
     try:
         fetch_remote_branches(args.remote)
 
@@ -824,10 +1164,16 @@ def main() -> None:
         touched_files: Set[str] = set()
         missing_prs: List[int] = []
 
-        for pr_num in selected_prs:
+        view_futures = [executor.submit(get_pr_view, pr_num) for pr_num in selected_prs]
+        comment_futures = {
+            pr_num: executor.submit(get_pr_comments, pr_num) for pr_num in selected_prs
+        }
+        pr_views: Dict[int, Tuple[List[str], List[Dict[str, str]]]] = {}
+        for pr_num, view_future in zip(selected_prs, view_futures):
             try:
-                pr_info = get_pr_info(pr_num)
+                pr_info, pr_files, pr_checks = view_future.result()
                 pr_infos.append(pr_info)
+                pr_views[pr_num] = (pr_files, pr_checks)
                 print(f"  PR #{pr_num}: {pr_info['title']}")
             except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as exc:
                 print(f"  PR #{pr_num}: Not found or inaccessible ({exc})")
@@ -837,6 +1183,18 @@ def main() -> None:
             print("Error: No valid PRs found for the requested selection")
             sys.exit(1)
 
+        # Only PRs with files left to report get their logs. A checkout that
+        # fails later still wastes its PR's downloads; waiting for checkouts
+        # would lose the overlap with them.
+        log_futures = submit_failed_run_logs(
+            executor,
+            {
+                pr_num: checks
+                for pr_num, (files, checks) in pr_views.items()
+                if not all(is_excluded_file(path) for path in files)
+            },
+        )
+
         successful_prs: List[Tuple[Dict[str, str], str]] = []
         successful_prs_with_logs: List[Tuple[Dict[str, str], str]] = []
         processed_prs: List[Dict[str, object]] = []
@@ -845,12 +1203,7 @@ def main() -> None:
         for pr_info in pr_infos:
             print(f"\n--- Processing PR #{pr_info['number']}: {pr_info['title']} ---")
 
-            try:
-                all_files = get_pr_changed_files(pr_info["number"])
-            except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as exc:
-                print(f"Failed to retrieve files for PR #{pr_info['number']}: {exc}")
-                continue
-
+            all_files, checks = pr_views[pr_info["number"]]
             if not all_files:
                 print(f"No changed files found for PR #{pr_info['number']}")
                 continue
@@ -865,6 +1218,7 @@ def main() -> None:
                 )
                 continue
 
+            left_base_branch = True
             try:
                 local_branch = checkout_pr_branch(pr_info, args.remote)
             except subprocess.CalledProcessError:
@@ -886,25 +1240,19 @@ def main() -> None:
             touched_files.update(existing_files)
 
             try:
-                comments = get_pr_comments(pr_info["number"])
+                comments = comment_futures[pr_info["number"]].result()
             except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as exc:
                 print(f"Failed to retrieve comments for PR #{pr_info['number']}: {exc}")
                 comments = []
 
-            try:
-                checks_with_logs: List[Dict[str, str]] = []
-                checks = get_pr_checks(pr_info["number"])
-            except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as exc:
-                print(f"Failed to retrieve checks for PR #{pr_info['number']}: {exc}")
-                checks = []
-                checks_with_logs = []
-            else:
-                for check in checks:
-                    check_copy = dict(check)
-                    logs = get_failed_check_logs(check_copy)
-                    if logs:
-                        check_copy["logOutput"] = logs
-                    checks_with_logs.append(check_copy)
+            checks_with_logs: List[Dict[str, str]] = []
+            for check in checks:
+                check_copy = dict(check)
+                log_future = log_futures.get(failed_check_run_id(check_copy))
+                logs = log_future.result() if log_future else None
+                if logs:
+                    check_copy["logOutput"] = logs
+                checks_with_logs.append(check_copy)
 
             output_file = os.path.join(
                 args.output_dir, f"pr-{pr_info['number']}-implementation.txt"
@@ -917,8 +1265,9 @@ def main() -> None:
                 existing_files,
                 comments,
                 checks,
+                checks_with_logs,
                 output_file,
-                include_logs=False,
+                output_file_with_logs,
                 base_branch=args.base_branch,
                 local_branch=local_branch,
             ):
@@ -931,16 +1280,6 @@ def main() -> None:
                         "files": existing_files,
                     }
                 )
-            if run_big_picture(
-                pr_info,
-                existing_files,
-                comments,
-                checks_with_logs,
-                output_file_with_logs,
-                include_logs=True,
-                base_branch=args.base_branch,
-                local_branch=local_branch,
-            ):
                 successful_prs_with_logs.append((pr_info, output_file_with_logs))
                 processed_prs_with_logs.append(
                     {
@@ -965,46 +1304,65 @@ def main() -> None:
             if skipped_prs:
                 print(f"Skipped PRs after processing: {', '.join(map(str, skipped_prs))}")
 
-            master_output = os.path.join(
-                args.output_dir, f"pr-comparison-{selection_tag}.txt"
-            )
-            create_master_comparison(
-                successful_prs,
-                selection_requested,
-                selection_canonical,
-                selected_prs,
-                master_output,
-            )
+        master_output = os.path.join(args.output_dir, f"pr-comparison-{selection_tag}.txt")
+        summary_output = os.path.join(args.output_dir, f"pr-summaries-{selection_tag}.txt")
+        touched_output = os.path.join(
+            args.output_dir, f"pr-touched-files-{selection_tag}.txt"
+        )
+        master_output_with_logs = os.path.join(
+            args.output_dir, f"pr-comparison-{selection_tag}-with-logs.txt"
+        )
+        summary_output_with_logs = os.path.join(
+            args.output_dir, f"pr-summaries-{selection_tag}-with-logs.txt"
+        )
+        touched_output_with_logs = os.path.join(
+            args.output_dir, f"pr-touched-files-{selection_tag}-with-logs.txt"
+        )
 
-            summary_output = os.path.join(
-                args.output_dir, f"pr-summaries-{selection_tag}.txt"
+        # Masters and summaries are written per variant first; the touched
+        # files compilation then reads each base-branch blob once for both.
+        touched_outputs: List[Tuple[str, str | None, bool]] = []
+        for pr_files, include_logs, master_path, summary_path, touched_path in (
+            (successful_prs, False, master_output, summary_output, touched_output),
+            (
+                successful_prs_with_logs,
+                True,
+                master_output_with_logs,
+                summary_output_with_logs,
+                touched_output_with_logs,
+            ),
+        ):
+            if not pr_files:
+                continue
+            create_master_comparison(
+                pr_files,
+                selection_header,
+                master_path,
+                include_logs=include_logs,
             )
             create_summary_compilation(
-                successful_prs,
-                selection_requested,
-                selection_canonical,
-                selected_prs,
-                summary_output,
+                pr_files,
+                selection_header,
+                summary_path,
+                include_logs=include_logs,
             )
+            touched_outputs.append((touched_path, master_path, include_logs))
 
-            touched_output = os.path.join(
-                args.output_dir, f"pr-touched-files-{selection_tag}.txt"
-            )
+        if touched_outputs:
             create_touched_files_compilation(
                 touched_files,
                 args.base_branch,
-                selection_requested,
-                selection_canonical,
-                selected_prs,
-                touched_output,
-                master_output,
+                selection_header,
+                touched_outputs,
             )
+
+        if successful_prs:
             round_robin_outputs = create_round_robin_comparisons(
                 processed_prs,
                 args.output_dir,
-                selection_requested,
+                selection_header,
                 selection_canonical,
-                selected_prs,
+                max_workers=args.jobs,
             )
 
             print(f"\n✓ Successfully processed {len(successful_prs)} PR(s) (without logs)")
@@ -1021,44 +1379,6 @@ def main() -> None:
             print("\nNo PRs were successfully processed (without logs)")
 
         if successful_prs_with_logs:
-            master_output_with_logs = os.path.join(
-                args.output_dir, f"pr-comparison-{selection_tag}-with-logs.txt"
-            )
-            create_master_comparison(
-                successful_prs_with_logs,
-                selection_requested,
-                selection_canonical,
-                selected_prs,
-                master_output_with_logs,
-                include_logs=True,
-            )
-
-            summary_output_with_logs = os.path.join(
-                args.output_dir, f"pr-summaries-{selection_tag}-with-logs.txt"
-            )
-            create_summary_compilation(
-                successful_prs_with_logs,
-                selection_requested,
-                selection_canonical,
-                selected_prs,
-                summary_output_with_logs,
-                include_logs=True,
-            )
-
-            touched_output_with_logs = os.path.join(
-                args.output_dir, f"pr-touched-files-{selection_tag}-with-logs.txt"
-            )
-            create_touched_files_compilation(
-                touched_files,
-                args.base_branch,
-                selection_requested,
-                selection_canonical,
-                selected_prs,
-                touched_output_with_logs,
-                master_output_with_logs,
-                include_logs=True,
-            )
-
             print(f"\n✓ Successfully processed {len(successful_prs_with_logs)} PR(s) (with logs)")
             print(f"✓ Individual files (with logs): {args.output_dir}/pr-{{num}}-implementation-with-logs.txt")
             print(f"✓ Master comparison (with logs): {master_output_with_logs}")
@@ -1069,8 +1389,14 @@ def main() -> None:
 
     except KeyboardInterrupt:
         print("\nInterrupted by user")
+    except BrokenPipeError:
+        if not stdout_closed():
+            raise
+        discard_stdout()
+        raise SystemExit(1)
     finally:
-        if not args.no_cleanup:
+        executor.shutdown(cancel_futures=True)
+        if left_base_branch and not args.no_cleanup:
             try:
                 checkout_base_branch(args.base_branch)
                 print(f"✓ Returned to {args.base_branch} branch")
@@ -1079,4 +1405,10 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except BrokenPipeError:
+        if not stdout_closed():
+            raise
+        discard_stdout()
+        sys.exit(1)